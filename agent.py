@@ -3,6 +3,8 @@
 import random
 from collections import defaultdict
 from env import TicTacToeEnv
+from qtable import DenseQTable, load_table, save_table, to_dense
+from symmetry import INVERSE, SYMMETRIES, canonicalize
 
 
 class QLearningAgent:
@@ -14,14 +16,35 @@ class QLearningAgent:
         self,
         alpha: float = 0.5,     # learning rate
         gamma: float = 0.9,     # discount factor
-        epsilon: float = 0.1    # exploration rate
+        epsilon: float = 0.1,   # exploration rate
+        dense: bool = False,    # store Q in a DenseQTable (NumPy array)
+        symmetric: bool = False # share values between the 8 symmetric boards
     ):
         # Q[state][action] = value
-        self.Q = defaultdict(lambda: defaultdict(float))
+        if dense:
+            self.Q = DenseQTable()
+        else:
+            self.Q = defaultdict(lambda: defaultdict(float))
 
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.symmetric = symmetric
+        self.episodes = 0       # training episodes seen so far
+        self.both_roles = False # also trained as the second mover (train.train)
+
+    # ── Symmetry ──────────────────────────────────────────────────────────
+    #
+    # With symmetric=True only canonical boards (symmetry.canonicalize) are
+    # stored, and actions are mapped into and out of the canonical frame.
+
+    def q_values(self, state):
+        """Q-values of `state`, indexable by the actual board cell."""
+        if not self.symmetric:
+            return self.Q[state]
+        canonical, s = canonicalize(state)
+        row = self.Q[canonical]
+        return [row[i] for i in INVERSE[s]]
 
     # ── Action selection ──────────────────────────────────────────────────
 
@@ -34,6 +57,11 @@ class QLearningAgent:
             return random.choice(available_actions)
 
         # Exploit (pick best known action)
+        if self.symmetric:
+            state, s = canonicalize(state)
+            inverse = INVERSE[s]
+            available_actions = [inverse[a] for a in available_actions]
+
         q_values = self.Q[state]
         max_q = float("-inf")
         best_actions = []
@@ -46,7 +74,10 @@ class QLearningAgent:
             elif value == max_q:
                 best_actions.append(action)
 
-        return random.choice(best_actions)
+        action = random.choice(best_actions)
+        if self.symmetric:
+            action = SYMMETRIES[s][action]
+        return action
 
     # ── Learning ──────────────────────────────────────────────────────────
 
@@ -54,6 +85,13 @@ class QLearningAgent:
         """
         Apply the Q-learning update rule.
         """
+        if self.symmetric:
+            state, s = canonicalize(state)
+            action = INVERSE[s][action]
+            if next_available_actions:
+                next_state, s = canonicalize(next_state)
+                inverse = INVERSE[s]
+                next_available_actions = [inverse[a] for a in next_available_actions]
 
         current_q = self.Q[state][action]
 
@@ -65,4 +103,33 @@ class QLearningAgent:
             target = reward + self.gamma * next_max_q
 
         # Bellman update
-        self.Q[state][action] = current_q + self.alpha * (target - current_q)
\ No newline at end of file
+        self.Q[state][action] = current_q + self.alpha * (target - current_q)
+
+    # ── Persistence ───────────────────────────────────────────────────────
+
+    def save(self, path: str):
+        """
+        Write the Q-table and hyperparameters to `path` (see qtable.py
+        for the format). Dict-backed tables are converted to dense first.
+        """
+        save_table(
+            to_dense(self.Q), path,
+            alpha=self.alpha, gamma=self.gamma, episodes=self.episodes,
+            symmetric=self.symmetric, both_roles=self.both_roles,
+        )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, epsilon: float = 0.0):
+        """
+        Load an agent saved with `save`. The table is memory-mapped unless
+        mmap=False. Exploration defaults to off.
+        """
+        table, meta = load_table(path, mmap=mmap)
+        agent = cls(
+            alpha=meta["alpha"], gamma=meta["gamma"], epsilon=epsilon,
+            symmetric=meta["symmetric"],
+        )
+        agent.Q = table
+        agent.episodes = meta["episodes"]
+        agent.both_roles = meta["both_roles"]
+        return agent
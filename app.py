@@ -1,10 +1,31 @@
 # app.py — Streamlit Tic-Tac-Toe AI
 # Run with: streamlit run app.py
 
-import random
-import math
+import os
+import threading
+
 import streamlit as st
-from collections import defaultdict
+
+from env import TicTacToeEnv
+from gamelog import GameLogWriter
+from model_cache import CACHE
+from registry import make_agent, q_agent_key, trained_q_agent
+
+# Trained agents and solver tables live in a process-wide cache shared by all
+# sessions; reload any agents snapshotted by an earlier process.
+CACHE.warm()
+
+
+@st.cache_resource
+def game_log():
+    """
+    Binary log of every finished game (gamelog.py), shared by all
+    sessions, in TTT_GAME_LOG_DIR (default "logs").
+    """
+    log = GameLogWriter(
+        os.environ.get("TTT_GAME_LOG_DIR", "logs"), prefix="app", flush_every=1,
+    )
+    return log, threading.Lock()
 
 # ──────────────────────────────────────────────────────────────────────────────
 # PAGE CONFIG
@@ -183,149 +204,26 @@ div[data-testid="stMarkdownContainer"] p {
 """, unsafe_allow_html=True)
 
 # ──────────────────────────────────────────────────────────────────────────────
-# ENVIRONMENT
-# ──────────────────────────────────────────────────────────────────────────────
-
-WINS = [(0,1,2),(3,4,5),(6,7,8),(0,3,6),(1,4,7),(2,5,8),(0,4,8),(2,4,6)]
-
-def check_win(board, player):
-    return any(board[a]==board[b]==board[c]==player for a,b,c in WINS)
-
-def winning_combo(board, player):
-    for combo in WINS:
-        a,b,c = combo
-        if board[a]==board[b]==board[c]==player:
-            return combo
-    return None
-
-def check_draw(board):
-    return all(v != 0 for v in board)
-
-def available_actions(board):
-    return [i for i,v in enumerate(board) if v == 0]
-
-# ──────────────────────────────────────────────────────────────────────────────
-# MINIMAX (with alpha-beta pruning)
+# AGENTS (shared engine — see registry.py)
 # ──────────────────────────────────────────────────────────────────────────────
 
-def minimax(board, depth, is_max, agent_player, alpha=-math.inf, beta=math.inf):
-    opponent = -agent_player
-    if check_win(board, agent_player):
-        return 10 - depth
-    if check_win(board, opponent):
-        return depth - 10
-    moves = available_actions(board)
-    if not moves:
-        return 0
-
-    if is_max:
-        best = -math.inf
-        for m in moves:
-            board[m] = agent_player
-            best = max(best, minimax(board, depth+1, False, agent_player, alpha, beta))
-            board[m] = 0
-            alpha = max(alpha, best)
-            if beta <= alpha:
-                break
-        return best
-    else:
-        best = math.inf
-        for m in moves:
-            board[m] = opponent
-            best = min(best, minimax(board, depth+1, True, agent_player, alpha, beta))
-            board[m] = 0
-            beta = min(beta, best)
-            if beta <= alpha:
-                break
-        return best
-
-def minimax_move(board, agent_player):
-    best_score = -math.inf
-    best_move = None
-    for m in available_actions(board):
-        board[m] = agent_player
-        score = minimax(board, 0, False, agent_player)
-        board[m] = 0
-        if score > best_score:
-            best_score = score
-            best_move = m
-    return best_move
-
-# ──────────────────────────────────────────────────────────────────────────────
-# Q-LEARNING AGENT (train in session)
-# ──────────────────────────────────────────────────────────────────────────────
-
-class QLearningAgent:
-    def __init__(self, alpha=0.5, gamma=0.9, epsilon=0.0):
-        self.Q = defaultdict(lambda: defaultdict(float))
-        self.alpha = alpha
-        self.gamma = gamma
-        self.epsilon = epsilon
-
-    def choose_action(self, state, actions):
-        if random.random() < self.epsilon:
-            return random.choice(actions)
-        q = self.Q[state]
-        best = max(actions, key=lambda a: q[a])
-        return best
-
-    def update(self, state, action, reward, next_state, next_actions):
-        cur = self.Q[state][action]
-        if not next_actions:
-            target = reward
-        else:
-            target = reward + self.gamma * max(self.Q[next_state][a] for a in next_actions)
-        self.Q[state][action] = cur + self.alpha * (target - cur)
-
-def train_q_agent(episodes=30_000):
-    agent = QLearningAgent(alpha=0.5, gamma=0.9, epsilon=1.0)
-    eps_decay = 0.9999
-    eps_min = 0.05
-    for _ in range(episodes):
-        board = [0]*9
-        done = False
-        state = tuple(board)
-        while not done:
-            acts = available_actions(board)
-            action = agent.choose_action(state, acts)
-            board[action] = 1
-            if check_win(board, 1):
-                agent.update(state, action, 1, tuple(board), [])
-                done = True; break
-            if check_draw(board):
-                agent.update(state, action, 0.5, tuple(board), [])
-                done = True; break
-            next_state = tuple(board)
-            opp_acts = available_actions(board)
-            opp = random.choice(opp_acts)
-            board[opp] = -1
-            if check_win(board, -1):
-                agent.update(state, action, -1, tuple(board), [])
-                done = True; break
-            if check_draw(board):
-                agent.update(state, action, 0.5, tuple(board), [])
-                done = True; break
-            next_state2 = tuple(board)
-            agent.update(state, action, 0, next_state2, available_actions(board))
-            state = next_state2
-        agent.epsilon = max(eps_min, agent.epsilon * eps_decay)
-    agent.epsilon = 0.0
-    return agent
+# Sidebar label -> registry name. Minimax play is served from the
+# precomputed solution table.
+AI_MODES = {"Minimax": "Solved", "Q-Learning": "Q-Learning", "Random": "Random"}
 
 # ──────────────────────────────────────────────────────────────────────────────
 # SESSION STATE INIT
 # ──────────────────────────────────────────────────────────────────────────────
 
 def init_state():
-    if "board" not in st.session_state:
-        st.session_state.board = [0]*9
-        st.session_state.done = False
-        st.session_state.winner = None
+    if "env" not in st.session_state:
+        st.session_state.env = TicTacToeEnv()
         st.session_state.current_player = 1   # 1=human X, -1=AI O
         st.session_state.score = {"W":0,"L":0,"D":0}
         st.session_state.move_log = []
         st.session_state.q_agent = None
         st.session_state.q_trained = False
+        st.session_state.q_symmetric = False
         st.session_state.ai_mode = "Minimax"
         st.session_state.human_goes_first = True
 
@@ -339,9 +237,7 @@ HUMAN = 1
 AI = -1
 
 def new_game():
-    st.session_state.board = [0]*9
-    st.session_state.done = False
-    st.session_state.winner = None
+    st.session_state.env.reset()
     st.session_state.move_log = []
     # Alternate first move or keep setting
     if st.session_state.human_goes_first:
@@ -354,55 +250,50 @@ def log(msg):
     if len(st.session_state.move_log) > 20:
         st.session_state.move_log.pop()
 
+def record_result(env):
+    log, lock = game_log()
+    with lock:
+        log.write_env(env)
+    if env.winner == HUMAN:
+        st.session_state.score["W"] += 1
+    elif env.winner == AI:
+        st.session_state.score["L"] += 1
+    else:
+        st.session_state.score["D"] += 1
+
 def ai_move():
-    board = st.session_state.board
+    env = st.session_state.env
     mode = st.session_state.ai_mode
-    if mode == "Minimax":
-        action = minimax_move(board[:], AI)
+    if mode == "Q-Learning" and st.session_state.q_agent is None:
+        agent = make_agent("Random", AI)
     elif mode == "Q-Learning":
-        if st.session_state.q_agent is None:
-            action = random.choice(available_actions(board))
-        else:
-            state = tuple(board)
-            acts = available_actions(board)
-            action = st.session_state.q_agent.choose_action(state, acts)
-    else:  # Random
-        action = random.choice(available_actions(board))
+        agent = make_agent("Q-Learning", AI, agent=st.session_state.q_agent)
+    else:
+        agent = make_agent(AI_MODES[mode], AI)
+    action = agent.select_move(env)
 
-    board[action] = AI
+    env.step(action, AI)
     log(f"AI → cell {action}")
 
-    if check_win(board, AI):
-        st.session_state.done = True
-        st.session_state.winner = AI
-        st.session_state.score["L"] += 1
-    elif check_draw(board):
-        st.session_state.done = True
-        st.session_state.winner = 0
-        st.session_state.score["D"] += 1
+    if env.done:
+        record_result(env)
     else:
         st.session_state.current_player = HUMAN
 
 def human_move(idx):
-    board = st.session_state.board
-    if board[idx] != 0 or st.session_state.done:
+    env = st.session_state.env
+    if env.done or idx not in env.available_actions():
         return
-    board[idx] = HUMAN
+    env.step(idx, HUMAN)
     log(f"You → cell {idx}")
-    if check_win(board, HUMAN):
-        st.session_state.done = True
-        st.session_state.winner = HUMAN
-        st.session_state.score["W"] += 1
-    elif check_draw(board):
-        st.session_state.done = True
-        st.session_state.winner = 0
-        st.session_state.score["D"] += 1
+    if env.done:
+        record_result(env)
     else:
         st.session_state.current_player = AI
         ai_move()
 
 # If AI goes first and it's AI's turn at start of render
-if not st.session_state.done and st.session_state.current_player == AI:
+if not st.session_state.env.done and st.session_state.current_player == AI:
     ai_move()
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -422,10 +313,25 @@ with st.sidebar:
         new_game()
 
     if mode == "Q-Learning":
+        symmetric = st.checkbox(
+            "Merge symmetric boards",
+            value=st.session_state.q_symmetric,
+            help="Learn one value per board up to rotation / reflection",
+        )
+        if symmetric != st.session_state.q_symmetric:
+            st.session_state.q_symmetric = symmetric
+            st.session_state.q_agent = None
+            st.session_state.q_trained = False
+        q_key = q_agent_key(symmetric=symmetric)
+
+        if not st.session_state.q_trained and q_key in CACHE:
+            # Already trained by this process (or loaded from a snapshot)
+            st.session_state.q_agent = CACHE.peek(q_key)
+            st.session_state.q_trained = True
         if not st.session_state.q_trained:
-            if st.button("🧠 Train Q-Agent (30k episodes)"):
+            if st.button("🧠 Train Q-Agent (60k episodes)"):
                 with st.spinner("Training... ~10 sec"):
-                    st.session_state.q_agent = train_q_agent(30_000)
+                    st.session_state.q_agent = trained_q_agent(symmetric=symmetric)
                     st.session_state.q_trained = True
                 st.success("Q-Agent trained!")
         else:
@@ -481,9 +387,10 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # Status banner
-board = st.session_state.board
-if st.session_state.done:
-    w = st.session_state.winner
+env = st.session_state.env
+board = env.board
+if env.done:
+    w = env.winner
     if w == HUMAN:
         st.markdown('<div class="status-banner win">🎉 You win!</div>', unsafe_allow_html=True)
     elif w == AI:
@@ -498,9 +405,9 @@ else:
 
 # Winning cells
 win_cells = set()
-w = st.session_state.winner
+w = env.winner
 if w in (HUMAN, AI):
-    combo = winning_combo(board, w)
+    combo = env.winning_line(w)
     if combo:
         win_cells = set(combo)
 
@@ -515,7 +422,7 @@ for row in range(3):
         sym = SYMBOLS[val]
         with cols[col]:
             label = sym if val != 0 else " "
-            disabled = (val != 0) or st.session_state.done or st.session_state.current_player == AI
+            disabled = (val != 0) or env.done or st.session_state.current_player == AI
             if st.button(
                 label,
                 key=f"cell_{idx}",
@@ -0,0 +1,106 @@
+# batch_env.py
+
+import numpy as np
+
+from env import WIN_MASKS
+
+# LINES[l, i] == 1 if cell i belongs to winning line l
+LINES = np.array(
+    [[mask >> i & 1 for i in range(9)] for mask in WIN_MASKS], dtype=np.int8
+)
+
+
+class BatchTicTacToeEnv:
+    """
+    N independent Tic-Tac-Toe games stepped together with NumPy.
+
+    boards:  int8 array (N, 9), same encoding as TicTacToeEnv
+             (1 -> X, -1 -> O, 0 -> empty)
+    to_move: int8 array (N,), the player whose turn it is in each game
+    done:    bool array (N,)
+    winner:  int8 array (N,), 1 / -1 / 0 once a game is over
+
+    first:   int8 array (N,), the player who opens each game; 1 (X) by
+             default, or give `first` (a player or an array of them)
+
+    With auto_reset=True (the default) a finished game is put back to an
+    empty board, `first` to move, at the end of the step that finished it.
+    """
+
+    def __init__(self, n: int, auto_reset: bool = True, seed=None, first=1):
+        self.n = n
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self.first = np.broadcast_to(np.asarray(first, dtype=np.int8), (n,)).copy()
+        self.reset()
+
+    def reset(self):
+        """Reset every board and return the (N, 9) boards array."""
+        self.boards = np.zeros((self.n, 9), dtype=np.int8)
+        self.to_move = self.first.copy()
+        self.done = np.zeros(self.n, dtype=bool)
+        self.winner = np.zeros(self.n, dtype=np.int8)
+        return self.boards
+
+    # ── Core API ────────────────────────────────────────────────────────────
+
+    def step(self, actions):
+        """
+        Play `actions[g]` for the side to move in every game g that is not
+        over. Occupied cells lose the game, as in TicTacToeEnv.step.
+
+        Returns:
+            boards, rewards, dones, winners
+
+        `boards` are the positions after the move (before any auto-reset),
+        `rewards` are from the mover's point of view, and `dones`/`winners`
+        flag the games that ended on this step.
+        """
+        actions = np.asarray(actions)
+        live = ~self.done
+        rows = np.nonzero(live)[0]
+        cols = actions[rows]
+        movers = self.to_move[rows]
+
+        invalid = np.zeros(self.n, dtype=bool)
+        invalid[rows] = self.boards[rows, cols] != 0
+        ok = rows[~invalid[rows]]
+        self.boards[ok, actions[ok]] = self.to_move[ok]
+
+        owned = (self.boards * self.to_move[:, None]) == 1
+        won = live & ~invalid & ((owned.astype(np.int8) @ LINES.T) == 3).any(1)
+        full = live & ~invalid & ~won & (self.boards != 0).all(1)
+        finished = invalid | won | full
+
+        rewards = np.zeros(self.n, dtype=np.int8)
+        rewards[won] = 1
+        rewards[invalid] = -1
+
+        winners = np.zeros(self.n, dtype=np.int8)
+        winners[won] = self.to_move[won]
+        winners[invalid] = -self.to_move[invalid]
+
+        self.done |= finished
+        self.winner[finished] = winners[finished]
+        self.to_move[live] = -movers
+
+        boards = self.boards.copy()
+        if self.auto_reset and finished.any():
+            self.boards[finished] = 0
+            self.to_move[finished] = self.first[finished]
+            self.done[finished] = False
+            self.winner[finished] = 0
+
+        return boards, rewards, finished, winners
+
+    # ── Helpers ─────────────────────────────────────────────────────────────
+
+    def legal_mask(self):
+        """Bool array (N, 9) of empty cells."""
+        return self.boards == 0
+
+    def random_actions(self):
+        """One uniformly random legal move per game, sampled in one call."""
+        keys = self.rng.random((self.n, 9))
+        keys[~self.legal_mask()] = -1.0
+        return keys.argmax(1)
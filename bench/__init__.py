@@ -0,0 +1,5 @@
+# bench/__init__.py
+#
+# Micro-benchmarks for the engine. Run modules from the repo root, e.g.
+#   python -m bench            (full suite, see bench/__main__.py)
+#   python -m bench.bitboard
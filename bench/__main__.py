@@ -0,0 +1,91 @@
+# bench/__main__.py
+#
+#   python -m bench                              # run everything, print a table
+#   python -m bench --json out.json              # also save the results
+#   python -m bench --compare baseline.json      # fail on regressions
+#   python -m bench --filter minimax             # substring match on case names
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from bench.suite import CASES, run
+
+
+def _format_rate(ops_per_sec: float) -> str:
+    return f"{ops_per_sec:,.0f}"
+
+
+def compare(results, baseline, threshold: float):
+    """
+    Print the change against `baseline` per case and return the names
+    that got slower by more than `threshold` (a fraction).
+    """
+    regressions = []
+    print(f"\n{'case':<40} {'baseline ns':>12} {'now ns':>12} {'change':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<40} {'-':>12} {result['ns_per_op']:>12,.1f} {'new':>8}")
+            continue
+        change = result["ns_per_op"] / before["ns_per_op"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<40} {before['ns_per_op']:>12,.1f} "
+            f"{result['ns_per_op']:>12,.1f} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench", description="Benchmark the engine hot paths."
+    )
+    parser.add_argument("--json", metavar="PATH", help="write results to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="baseline results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="slowdown fraction that counts as a regression (default 0.10)",
+    )
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=3, help="timing rounds per case")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter in name]
+    results = {}
+    print(f"{'case':<40} {'ns/op':>14} {'ops/sec':>14}")
+    for name in names:
+        result = run([name], min_time=args.min_time, repeat=args.repeat)[name]
+        results[name] = result
+        print(f"{name:<40} {result['ns_per_op']:>14,.1f} {_format_rate(result['ops_per_sec']):>14}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    },
+                    "results": results,
+                },
+                f, indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
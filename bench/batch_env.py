@@ -0,0 +1,44 @@
+# bench/batch_env.py
+#
+# Random-vs-random games/sec: TicTacToeEnv loop vs BatchTicTacToeEnv at
+# several batch sizes.
+#
+#   python -m bench.batch_env
+
+import random
+import time
+
+from batch_env import BatchTicTacToeEnv
+from env import TicTacToeEnv
+
+
+def single_env(games: int) -> float:
+    env = TicTacToeEnv()
+    start = time.perf_counter()
+    for _ in range(games):
+        env.reset()
+        player = 1
+        while not env.done:
+            env.step(random.choice(env.available_actions()), player)
+            player = -player
+    return games / (time.perf_counter() - start)
+
+
+def batch_env(batch_size: int, steps: int = 200) -> float:
+    env = BatchTicTacToeEnv(batch_size, seed=0)
+    games = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, dones, _ = env.step(env.random_actions())
+        games += int(dones.sum())
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'TicTacToeEnv':>18}: {single_env(20_000):>12,.0f} games/s")
+    for batch_size in (1, 64, 1_024, 16_384):
+        print(f"{'batch ' + str(batch_size):>18}: {batch_env(batch_size):>12,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
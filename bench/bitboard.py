@@ -0,0 +1,90 @@
+# bench/bitboard.py
+#
+# Steps-per-second comparison between the bitboard TicTacToeEnv and the
+# original list-based implementation.
+#
+#   python -m bench.bitboard
+
+import random
+import time
+
+from env import TicTacToeEnv
+
+
+class ListTicTacToeEnv:
+    """The original list-backed environment, kept as a reference point."""
+
+    WINS = [
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),
+        (0, 4, 8), (2, 4, 6),
+    ]
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.board = [0] * 9
+        self.done = False
+        self.winner = None
+        return tuple(self.board)
+
+    def step(self, action, player):
+        if self.done:
+            raise ValueError("Game is already over.")
+        if self.board[action] != 0:
+            self.done = True
+            self.winner = -player
+            return tuple(self.board), -1, True, {"invalid": True}
+        self.board[action] = player
+        if any(self.board[a] == self.board[b] == self.board[c] == player
+               for a, b, c in self.WINS):
+            self.done = True
+            self.winner = player
+            return tuple(self.board), 1, True, {"winner": player}
+        if all(v != 0 for v in self.board):
+            self.done = True
+            self.winner = 0
+            return tuple(self.board), 0, True, {"draw": True}
+        return tuple(self.board), 0, False, {}
+
+    def available_actions(self):
+        return [i for i, v in enumerate(self.board) if v == 0]
+
+    def clone(self):
+        new_env = ListTicTacToeEnv()
+        new_env.board = self.board.copy()
+        new_env.done = self.done
+        new_env.winner = self.winner
+        return new_env
+
+
+def random_games(env_cls, games: int, seed: int = 0):
+    """Play `games` random games, cloning before every step; return (steps, seconds)."""
+    rng = random.Random(seed)
+    env = env_cls()
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        env.reset()
+        player = 1
+        while not env.done:
+            env.clone()
+            env.step(rng.choice(env.available_actions()), player)
+            player = -player
+            steps += 1
+    return steps, time.perf_counter() - start
+
+
+def main(games: int = 50_000):
+    results = {}
+    for name, env_cls in (("list", ListTicTacToeEnv), ("bitboard", TicTacToeEnv)):
+        steps, seconds = random_games(env_cls, games)
+        results[name] = steps / seconds
+        print(f"{name:>8}: {steps / seconds:>12,.0f} steps/s  ({steps} steps)")
+    print(f" speedup: {results['bitboard'] / results['list']:.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# bench/loadgen.py
+#
+# Load generator for server.py: `clients` connections each play random
+# games back to back for `seconds`, then request latency percentiles and
+# throughput are printed. Starts an in-process server unless --port is
+# given.
+#
+#   python -m bench.loadgen [--clients 200] [--seconds 10] [--agent Solved]
+#   python -m bench.loadgen --port 8765          # against a running server
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from server import GameServer
+
+
+async def _request(reader, writer, latencies, **request):
+    start = time.perf_counter()
+    writer.write(json.dumps(request).encode() + b"\n")
+    response = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - start)
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response
+
+
+async def _client(host, port, agent, deadline, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    games = 0
+    try:
+        while time.perf_counter() < deadline:
+            human = rng.choice("XO")
+            game = await _request(reader, writer, latencies,
+                                  op="new_game", agent=agent, human=human)
+            while not game["done"]:
+                cell = rng.choice([i for i, v in enumerate(game["board"]) if v == 0])
+                game = await _request(reader, writer, latencies,
+                                      op="move", game=game["game"], cell=cell)
+            games += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return games
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run(clients: int, seconds: float, agent: str, host: str, port: int,
+              workers: int = None, window: float = 0.001):
+    server = None
+    if port is None:
+        server = GameServer(workers=workers, window=window)
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    try:
+        latencies = []
+        start = time.perf_counter()
+        games = await asyncio.gather(*(
+            _client(host, port, agent, start + seconds, latencies, seed)
+            for seed in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+        print(f"{clients} clients, {agent}, {elapsed:.1f} s")
+        print(f"  games:      {sum(games):,} ({sum(games) / elapsed:,.0f}/s)")
+        print(f"  requests:   {len(latencies):,} ({len(latencies) / elapsed:,.0f}/s)")
+        print(f"  latency:    p50 {_percentile(latencies, 0.50) * 1e3:.2f} ms, "
+              f"p99 {_percentile(latencies, 0.99) * 1e3:.2f} ms")
+        if server is not None:
+            stats = await server.stats()
+            print(f"  AI batches: {stats['batches']:,} "
+                  f"(mean {stats['mean_batch']:.1f} moves)")
+    finally:
+        if server is not None:
+            while server.connections:
+                await asyncio.sleep(0.01)
+            listener.close()
+            server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test server.py.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--agent", default="Solved")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="server to target (default: start one in-process)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(
+        args.clients, args.seconds, args.agent, args.host, args.port,
+        workers=args.workers, window=args.window_ms / 1e3,
+    ))
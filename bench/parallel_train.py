@@ -0,0 +1,35 @@
+# bench/parallel_train.py
+#
+# Episodes/sec of train.train_parallel as the worker count grows.
+#
+#   python -m bench.parallel_train [episodes]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+from train import train, train_parallel
+
+
+def _timed(fn, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(**kwargs)
+    return time.perf_counter() - start
+
+
+def main(episodes: int = 40_000):
+    seconds = _timed(train, episodes=episodes)
+    print(f"  serial: {episodes / seconds:>10,.0f} ep/s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        seconds = _timed(train_parallel, episodes=episodes, workers=workers)
+        print(f"{workers:>3} proc: {episodes / seconds:>10,.0f} ep/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
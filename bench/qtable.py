@@ -0,0 +1,68 @@
+# bench/qtable.py
+#
+# Memory and update throughput of the nested-defaultdict Q-table vs
+# DenseQTable, on the same trained agent.
+#
+#   python -m bench.qtable [episodes]
+
+import contextlib
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+from train import train
+
+
+def _trained(episodes, dense):
+    """Train twice: once for wall time, once under tracemalloc for memory."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(0)
+        start = time.perf_counter()
+        train(episodes=episodes, dense=dense)
+        seconds = time.perf_counter() - start
+
+        random.seed(0)
+        tracemalloc.start()
+        agent, _ = train(episodes=episodes, dense=dense)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    return agent, seconds, memory
+
+
+def _updates_per_sec(agent, transitions):
+    start = time.perf_counter()
+    for state, action, reward, next_state, next_actions in transitions:
+        agent.update(state, action, reward, next_state, next_actions)
+    return len(transitions) / (time.perf_counter() - start)
+
+
+def main(episodes: int = 50_000):
+    baseline = None
+    for dense in (False, True):
+        agent, seconds, memory = _trained(episodes, dense)
+        if baseline is None:
+            # Replay the same transitions through both tables
+            rng = random.Random(1)
+            states = list(agent.Q)
+            transitions = []
+            for _ in range(200_000):
+                state = rng.choice(states)
+                actions = [i for i, v in enumerate(state) if v == 0] or [0]
+                next_state = rng.choice(states)
+                next_actions = [i for i, v in enumerate(next_state) if v == 0]
+                transitions.append((state, rng.choice(actions), 0, next_state, next_actions))
+            baseline = transitions
+        rate = _updates_per_sec(agent, baseline)
+        name = "dense" if dense else "dict"
+        print(
+            f"{name:>5}: {len(agent.Q)} states | "
+            f"{memory / 1e6:6.2f} MB traced | "
+            f"train {episodes / seconds:>8,.0f} ep/s | "
+            f"update {rate:>10,.0f} /s"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
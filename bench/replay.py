@@ -0,0 +1,69 @@
+# bench/replay.py
+#
+# Online Q-learning vs learning from a replay buffer (uniform and
+# prioritized): episodes and wall time until the greedy policy reaches a
+# target win rate against a random opponent (scored exactly by
+# evaluate.exact_vs_random). Same schedule as train.train's replay mode,
+# with the app's hyperparameters (registry.Q_DEFAULTS) except for the
+# replay modes' learning rate, alpha_percent.
+#
+#   python -m bench.replay [target_percent] [seeds] [replay_batch] [replay_every] [alpha_percent]
+
+import random
+import sys
+import time
+
+from agent import QLearningAgent
+from env import TicTacToeEnv
+from evaluate import exact_vs_random
+from registry import Q_DEFAULTS
+from replay import ReplayBuffer
+from train import run_episode
+
+CHECK_EVERY = 1_000
+MAX_EPISODES = 200_000
+
+
+def _run(mode: str, target: float, seed: int, batch: int, every: int, alpha: float):
+    """(episodes, seconds) when `target` is first reached."""
+    random.seed(seed)
+    env = TicTacToeEnv()
+    agent = QLearningAgent(
+        alpha=Q_DEFAULTS["alpha"] if mode == "online" else alpha,
+        gamma=Q_DEFAULTS["gamma"], epsilon=1.0, dense=True,
+    )
+    buffer = learn = None
+    if mode != "online":
+        buffer = ReplayBuffer(prioritized=mode == "prioritized", seed=seed)
+        learn = buffer.add
+
+    elapsed = 0.0
+    for done in range(CHECK_EVERY, MAX_EPISODES + 1, CHECK_EVERY):
+        start = time.perf_counter()
+        for episode in range(done - CHECK_EVERY, done):
+            run_episode(env, agent, draw_reward=Q_DEFAULTS["draw_reward"], learn=learn)
+            if buffer is not None and (episode + 1) % every == 0 and len(buffer) >= batch:
+                buffer.learn(agent.Q.values, batch, agent.alpha, agent.gamma)
+            agent.epsilon = max(
+                Q_DEFAULTS["epsilon_min"], agent.epsilon * Q_DEFAULTS["epsilon_decay"]
+            )
+        elapsed += time.perf_counter() - start
+        if exact_vs_random(agent)["win"] >= target:
+            break
+    return done, elapsed
+
+
+def main(target_percent: int = 98, seeds: int = 5, batch: int = 128, every: int = 1,
+         alpha_percent: int = 20):
+    target = target_percent / 100
+    alpha = alpha_percent / 100
+    print(f"Episodes to {target:.0%} wins vs random (mean of {seeds} seeds; "
+          f"replay: {batch} transitions every {every} episodes, alpha {alpha})")
+    for mode in ("online", "uniform", "prioritized"):
+        runs = [_run(mode, target, seed, batch, every, alpha) for seed in range(seeds)]
+        episodes, seconds = (sum(col) / seeds for col in zip(*runs))
+        print(f"{mode:>12}: {episodes:>9,.0f} episodes, {seconds:5.2f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
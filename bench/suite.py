@@ -0,0 +1,277 @@
+# bench/suite.py
+#
+# Benchmarks for every engine hot path, collected by `python -m bench`.
+#
+# Each case is registered with @case(name) and returns (fn, ops): calling
+# fn() performs `ops` operations of the thing being measured. Setup work
+# belongs in the case body, outside fn.
+
+import contextlib
+import io
+import random
+import time
+
+from agent import QLearningAgent
+from env import TicTacToeEnv
+from evaluate import play_vs_random
+from minimax import MinimaxAgent, TranspositionTable
+from mnk import MNKEnv
+from registry import make_agent
+from search import AlphaBetaAgent
+from train import train
+
+CASES = {}
+
+# Mid-game positions as (moves played so far, side to move)
+POSITIONS = {
+    "opening": ((4,), -1),
+    "middle": ((4, 0, 2), -1),
+    "late": ((4, 0, 2, 6, 3), -1),
+}
+
+
+def case(name: str):
+    def decorator(setup):
+        CASES[name] = setup
+        return setup
+    return decorator
+
+
+def _position(moves):
+    env = TicTacToeEnv()
+    player = 1
+    for move in moves:
+        env.step(move, player)
+        player = -player
+    return env
+
+
+def _random_games(count: int, seed: int = 0):
+    """Move lists of `count` random games."""
+    rng = random.Random(seed)
+    games = []
+    env = TicTacToeEnv()
+    for _ in range(count):
+        env.reset()
+        moves, player = [], 1
+        while not env.done:
+            move = rng.choice(env.available_actions())
+            env.step(move, player)
+            moves.append(move)
+            player = -player
+        games.append(moves)
+    return games
+
+
+# ── Environment ─────────────────────────────────────────────────────────────
+
+@case("env.step")
+def _env_step():
+    games = _random_games(200)
+    env = TicTacToeEnv()
+
+    def fn():
+        for moves in games:
+            env.reset()
+            player = 1
+            for move in moves:
+                env.step(move, player)
+                player = -player
+
+    return fn, sum(len(moves) for moves in games)
+
+
+@case("env.clone")
+def _env_clone():
+    env = _position((4, 0, 2))
+
+    def fn():
+        for _ in range(1_000):
+            env.clone()
+
+    return fn, 1_000
+
+
+@case("env._check_win")
+def _env_check_win():
+    env = _position((4, 0, 2, 6, 3))
+
+    def fn():
+        for _ in range(1_000):
+            env._check_win(1)
+
+    return fn, 1_000
+
+
+@case("env.available_actions")
+def _env_available_actions():
+    env = _position((4, 0, 2))
+
+    def fn():
+        for _ in range(1_000):
+            env.available_actions()
+
+    return fn, 1_000
+
+
+# ── Search ──────────────────────────────────────────────────────────────────
+
+@case("minimax.select_move empty (cold)")
+def _minimax_cold():
+    env = TicTacToeEnv()
+
+    def fn():
+        MinimaxAgent(1, table=TranspositionTable()).select_move(env)
+
+    return fn, 1
+
+
+@case("minimax.select_move empty (warm)")
+def _minimax_warm():
+    env = TicTacToeEnv()
+    agent = MinimaxAgent(1)
+    agent.select_move(env)
+
+    def fn():
+        agent.select_move(env)
+
+    return fn, 1
+
+
+def _minimax_position(moves, player):
+    def setup():
+        env = _position(moves)
+
+        def fn():
+            MinimaxAgent(player, table=TranspositionTable()).select_move(env)
+
+        return fn, 1
+    return setup
+
+
+for _label, (_moves, _player) in POSITIONS.items():
+    case(f"minimax.select_move {_label} (cold)")(_minimax_position(_moves, _player))
+
+
+@case("alphabeta.select_move 7x7x4 depth 3")
+def _alpha_beta_mnk():
+    env = MNKEnv(7, 7, 4)
+    for player, move in ((1, 24), (-1, 25), (1, 17)):
+        env.step(move, player)
+
+    def fn():
+        # A fresh agent each time: a kept transposition table would
+        # answer the repeat from memory
+        AlphaBetaAgent(-1, time_budget=60, max_depth=3).select_move(env)
+
+    return fn, 1
+
+
+@case("app minimax move (Solved)")
+def _app_minimax():
+    # app.py answers "Minimax" with the registry's Solved engine
+    env = _position((4, 0, 2))
+    agent = make_agent("Solved", -1)
+
+    def fn():
+        for _ in range(1_000):
+            agent.select_move(env)
+
+    return fn, 1_000
+
+
+# ── Q-learning ──────────────────────────────────────────────────────────────
+
+def _q_transitions(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    transitions = []
+    for moves in _random_games(count, seed):
+        env = TicTacToeEnv()
+        player = 1
+        for move in moves:
+            state = env._get_state()
+            actions = env.available_actions()
+            next_state, reward, done, _ = env.step(move, player)
+            next_actions = [] if done else env.available_actions()
+            transitions.append((state, actions, move, reward, next_state, next_actions))
+            player = -player
+    rng.shuffle(transitions)
+    return transitions
+
+
+@case("QLearningAgent.choose_action")
+def _q_choose_action():
+    transitions = _q_transitions(300)
+    agent = QLearningAgent(epsilon=0.1)
+
+    def fn():
+        for state, actions, _, _, _, _ in transitions:
+            agent.choose_action(state, actions)
+
+    return fn, len(transitions)
+
+
+@case("QLearningAgent.update")
+def _q_update():
+    transitions = _q_transitions(300)
+    agent = QLearningAgent()
+
+    def fn():
+        for state, _, action, reward, next_state, next_actions in transitions:
+            agent.update(state, action, reward, next_state, next_actions)
+
+    return fn, len(transitions)
+
+
+# ── End to end ──────────────────────────────────────────────────────────────
+
+@case("train.train episode")
+def _train_episode():
+    def fn():
+        with contextlib.redirect_stdout(io.StringIO()):
+            train(episodes=2_000)
+
+    return fn, 2_000
+
+
+@case("evaluate.play_vs_random game")
+def _play_vs_random():
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent, _ = train(episodes=5_000)
+
+    def fn():
+        play_vs_random(agent, games=500)
+
+    return fn, 500
+
+
+# ── Harness ─────────────────────────────────────────────────────────────────
+
+def measure(fn, ops: int, min_time: float = 0.2, repeat: int = 3) -> float:
+    """Best-of-`repeat` nanoseconds per operation."""
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / (calls * ops))
+    return best * 1e9
+
+
+def run(names=None, min_time: float = 0.2, repeat: int = 3):
+    """Run the selected cases; return {name: {"ns_per_op", "ops_per_sec"}}."""
+    results = {}
+    for name, setup in CASES.items():
+        if names is not None and name not in names:
+            continue
+        random.seed(0)
+        fn, ops = setup()
+        ns = measure(fn, ops, min_time=min_time, repeat=repeat)
+        results[name] = {"ns_per_op": ns, "ops_per_sec": 1e9 / ns}
+    return results
@@ -0,0 +1,58 @@
+# bench/sweep.py
+#
+# Wall time to convergence of train.train_sweep vs episodic Q-learning.
+# Q-learning is checked every 10k episodes against the sweep's exact
+# Q-values and its greedy policy scored with evaluate.exact_vs_random.
+#
+#   python -m bench.sweep [episodes]
+
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+
+from agent import QLearningAgent
+from env import TicTacToeEnv
+from evaluate import exact_vs_random
+from qtable import state_index
+from train import run_episode, train_sweep
+
+DRAW_REWARD = 0.5
+
+
+def main(episodes: int = 200_000):
+    for sweep in ("synchronous", "prioritized"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            exact, info = train_sweep(sweep=sweep, draw_reward=DRAW_REWARD)
+        print(
+            f"{sweep:>12}: {info['iterations']} iterations, "
+            f"{info['seconds'] * 1e3:.1f} ms"
+        )
+    target = exact_vs_random(exact)["win"]
+    print(f"  sweep greedy policy: {target:.2%} wins vs random")
+
+    # Same schedule as train(), checked along the way
+    rows = [state_index(state) for state in exact.Q]
+    legal = np.array([[v == 0 for v in state] for state in exact.Q])
+    env = TicTacToeEnv()
+    agent = QLearningAgent(epsilon=1.0, dense=True)
+    elapsed = 0.0
+    for done in range(10_000, episodes + 1, 10_000):
+        start = time.perf_counter()
+        for _ in range(10_000):
+            run_episode(env, agent, draw_reward=DRAW_REWARD)
+            agent.epsilon = max(0.05, agent.epsilon * 0.99995)
+        elapsed += time.perf_counter() - start
+
+        error = np.abs(agent.Q.values[rows] - exact.Q.values[rows])[legal].mean()
+        wins = exact_vs_random(agent)["win"]
+        print(
+            f"{done:>9,} episodes: {elapsed:6.2f} s, "
+            f"mean |Q - Q*| {error:.3f}, {wins:.2%} wins vs random"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,60 @@
+# bench/symmetry.py
+#
+# Q-learning with and without symmetry-reduced states: table size, and
+# episodes / seconds until the greedy policy reaches a target win rate
+# against a random opponent (scored exactly by evaluate.exact_vs_random).
+# Uses the app's training settings (registry.Q_DEFAULTS).
+#
+#   python -m bench.symmetry [target_percent] [seeds]
+
+import random
+import sys
+import time
+
+from agent import QLearningAgent
+from env import TicTacToeEnv
+from evaluate import exact_vs_random
+from registry import Q_DEFAULTS
+from train import run_episode
+
+CHECK_EVERY = 1_000
+MAX_EPISODES = 200_000
+
+
+def _run(symmetric: bool, target: float, seed: int):
+    """(episodes, seconds, table size) when `target` is first reached."""
+    random.seed(seed)
+    env = TicTacToeEnv()
+    agent = QLearningAgent(
+        alpha=Q_DEFAULTS["alpha"], gamma=Q_DEFAULTS["gamma"], epsilon=1.0,
+        symmetric=symmetric,
+    )
+    elapsed = 0.0
+    for done in range(CHECK_EVERY, MAX_EPISODES + 1, CHECK_EVERY):
+        start = time.perf_counter()
+        for _ in range(CHECK_EVERY):
+            run_episode(env, agent, draw_reward=Q_DEFAULTS["draw_reward"])
+            agent.epsilon = max(
+                Q_DEFAULTS["epsilon_min"], agent.epsilon * Q_DEFAULTS["epsilon_decay"]
+            )
+        elapsed += time.perf_counter() - start
+        if exact_vs_random(agent)["win"] >= target:
+            break
+    return done, elapsed, len(agent.Q)
+
+
+def main(target_percent: int = 98, seeds: int = 5):
+    target = target_percent / 100
+    print(f"Episodes to {target:.0%} wins vs random (mean of {seeds} seeds)")
+    for symmetric in (False, True):
+        runs = [_run(symmetric, target, seed) for seed in range(seeds)]
+        episodes, seconds, size = (sum(col) / seeds for col in zip(*runs))
+        label = "symmetric" if symmetric else "plain"
+        print(
+            f"{label:>10}: {episodes:>9,.0f} episodes, {seconds:5.2f} s, "
+            f"{size:,.0f} states in Q"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
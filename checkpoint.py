@@ -0,0 +1,168 @@
+# checkpoint.py
+
+"""
+Incremental, atomic training checkpoints for train.train.
+
+A checkpoint directory holds a chain of files `ckpt-000001.pkl`,
+`ckpt-000002.pkl`, ... Each one stores only the Q-table rows that
+changed since the previous checkpoint (found by comparing the dense
+table against a copy of what was last saved), the states first seen
+since then, and the full small state: episode count, epsilon, alpha,
+gamma, win / loss / draw counts, the `random` module's state and the
+run's `settings` (the train() arguments that are not restored, such as
+the epsilon schedule). restore() replays the chain and refuses settings
+that differ, so resuming continues the exact same run.
+
+Files are written by a background thread to a temporary name, fsynced
+and renamed into place. A crash leaves at worst a stray temp file and
+the previous checkpoint intact. The training loop only pays for the
+row comparison and copy.
+"""
+
+import glob
+import os
+import pickle
+import random
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from env import NUM_RANKS
+from qtable import DenseQTable
+
+VERSION = 2
+PATTERN = "ckpt-*.pkl"
+
+
+def checkpoint_files(directory: str):
+    """Checkpoint files of `directory`, oldest first."""
+    return sorted(glob.glob(os.path.join(glob.escape(directory), PATTERN)))
+
+
+class Checkpointer:
+    """
+    Writes checkpoints of `agent` (a QLearningAgent with a DenseQTable)
+    and `settings` (a dict, checked by restore) to `directory`. With
+    resumed=True the directory's chain is extended from the agent's
+    current (restored) table; otherwise the directory must not hold a
+    chain already.
+    """
+
+    def __init__(self, directory: str, agent, resumed: bool = False,
+                 settings: dict = None):
+        if not isinstance(agent.Q, DenseQTable):
+            raise ValueError("checkpoints need a dense Q-table (dense=True)")
+        os.makedirs(directory, exist_ok=True)
+        existing = checkpoint_files(directory)
+        if existing and not resumed:
+            raise ValueError(
+                f"{directory} already holds a run; resume from it or use "
+                "another directory"
+            )
+
+        self.directory = directory
+        self.agent = agent
+        self.settings = dict(settings or {})
+        self.saved_episode = agent.episodes if existing else None
+        self._index = len(existing)
+        self._saved = agent.Q.values.copy() if existing else np.zeros((NUM_RANKS, 9), np.float32)
+        self._states = len(agent.Q) if existing else 0
+        self._writer = ThreadPoolExecutor(1)
+        self._pending = None
+
+    def save(self, stats: dict):
+        """
+        Snapshot the agent and `stats` now and write the checkpoint in
+        the background. Raises any error from the previous write.
+        """
+        self._check()
+        agent = self.agent
+        values = agent.Q.values
+        rows = np.flatnonzero((values != self._saved).any(1)).astype(np.int32)
+        changed = values[rows]
+        self._saved[rows] = changed
+
+        states = list(islice(agent.Q, self._states, None))
+        self._states += len(states)
+
+        record = {
+            "version": VERSION,
+            "episode": agent.episodes,
+            "alpha": agent.alpha,
+            "gamma": agent.gamma,
+            "epsilon": agent.epsilon,
+            "symmetric": agent.symmetric,
+            "settings": self.settings,
+            "stats": dict(stats),
+            "rng": random.getstate(),
+            "rows": rows,
+            "values": changed,
+            "states": states,
+        }
+        self._index += 1
+        path = os.path.join(self.directory, f"ckpt-{self._index:06d}.pkl")
+        self._pending = self._writer.submit(_write, path, record)
+        self.saved_episode = agent.episodes
+
+    def close(self):
+        """Wait for the last write to finish (and raise its error, if any)."""
+        self._writer.shutdown(wait=True)
+        self._check()
+
+    def _check(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+
+def _write(path: str, record: dict):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def restore(directory: str, agent, stats: dict, settings: dict = None) -> int:
+    """
+    Load the checkpoint chain of `directory` into `agent` (dense table),
+    `stats` and the `random` module. Returns the episode count reached.
+    Raises ValueError if `settings` differ from the ones checkpointed.
+    """
+    files = checkpoint_files(directory)
+    if not files:
+        raise ValueError(f"{directory}: no checkpoints to resume from")
+
+    values = np.zeros((NUM_RANKS, 9), dtype=np.float32)
+    states = []
+    for name in files:
+        with open(name, "rb") as f:
+            record = pickle.load(f)
+        if record["version"] != VERSION:
+            raise ValueError(f"{name}: unsupported checkpoint version {record['version']}")
+        values[record["rows"]] = record["values"]
+        states += record["states"]
+
+    for name, value in (settings or {}).items():
+        saved = record["settings"].get(name)
+        if saved != value:
+            raise ValueError(
+                f"{directory} was trained with {name}={saved!r}; "
+                f"resuming with {name}={value!r} would change the run"
+            )
+
+    table = DenseQTable(values)
+    for state in states:
+        table[state]
+    agent.Q = table
+    agent.alpha = record["alpha"]
+    agent.gamma = record["gamma"]
+    agent.epsilon = record["epsilon"]
+    agent.symmetric = record["symmetric"]
+    agent.episodes = record["episode"]
+    stats.clear()
+    stats.update(record["stats"])
+    random.setstate(record["rng"])
+    return record["episode"]
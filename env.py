@@ -1,5 +1,71 @@
 # env.py
 
+from zobrist import zobrist_table
+
+# ── Bitboard tables ─────────────────────────────────────────────────────────
+#
+# Each side is a 9-bit integer, bit i set <=> that side owns cell i.
+
+FULL = 0x1FF
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # cols
+    0b100010001, 0b001010100,               # diagonals
+)
+
+# IS_WIN[bits] -> True if `bits` contains a full line
+IS_WIN = tuple(
+    any(bits & m == m for m in WIN_MASKS) for bits in range(FULL + 1)
+)
+
+# MOVES[empty] -> tuple of set-bit indices, in ascending order
+MOVES = tuple(
+    tuple(i for i in range(9) if empty >> i & 1) for empty in range(FULL + 1)
+)
+
+# TERNARY[bits] -> sum of 3**i over set bits; a position's base-3 rank is
+# TERNARY[a] + 2 * TERNARY[b] (a's cells are 1s, b's cells are 2s)
+TERNARY = tuple(
+    sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(FULL + 1)
+)
+NUM_RANKS = 3 ** 9
+
+# Zobrist numbers of every cell for X and for O (zobrist.py)
+X_KEYS, O_KEYS = zobrist_table(9)
+
+# Hashable 9-tuple states, filled lazily and keyed by (x << 9) | o
+_STATES = {}
+
+
+def bits_to_state(x: int, o: int):
+    """Return the 9-tuple state for the bitboards (x, o)."""
+    key = x << 9 | o
+    state = _STATES.get(key)
+    if state is None:
+        state = tuple(
+            1 if x >> i & 1 else -1 if o >> i & 1 else 0 for i in range(9)
+        )
+        _STATES[key] = state
+    return state
+
+
+def state_to_bits(state):
+    """Inverse of `bits_to_state`: return (x, o) for a 9-cell board."""
+    x = o = 0
+    for i, v in enumerate(state):
+        if v == 1:
+            x |= 1 << i
+        elif v == -1:
+            o |= 1 << i
+    return x, o
+
+
+def rank(a: int, b: int) -> int:
+    """Base-3 rank in [0, 3**9) of the bitboard pair (a, b)."""
+    return TERNARY[a] + 2 * TERNARY[b]
+
+
 class TicTacToeEnv:
     """
     Simple Tic-Tac-Toe environment.
@@ -15,16 +81,32 @@ class TicTacToeEnv:
       3 | 4 | 5
       ---------
       6 | 7 | 8
+
+    Internally each side is stored as a 9-bit integer (`x`, `o`);
+    `board` rebuilds the list view on demand. `key` is the position's
+    Zobrist key (zobrist.py), updated by XOR on every move and undo.
+
+    push() / pop() play and take back moves in place for search, without
+    the validation and return values of step().
     """
 
+    __slots__ = ("x", "o", "key", "done", "winner", "history")
+
+    # Board geometry, shared with MNKEnv (mnk.py) so generic engines work on both
+    m = n = k = 3
+    lines = tuple(MOVES[mask] for mask in WIN_MASKS)
+
     def __init__(self):
         self.reset()
 
     def reset(self):
         """Reset the board and return the initial state."""
-        self.board = [0] * 9
+        self.x = 0
+        self.o = 0
+        self.key = 0
         self.done = False
         self.winner = None
+        self.history = []    # cells played so far (step or push), for pop()
         return self._get_state()
 
     # ── Core API ────────────────────────────────────────────────────────────
@@ -39,22 +121,32 @@ class TicTacToeEnv:
         if self.done:
             raise ValueError("Game is already over.")
 
+        bit = 1 << action
+
         # Invalid move
-        if self.board[action] != 0:
+        if (self.x | self.o) & bit:
             self.done = True
             self.winner = -player
             return self._get_state(), -1, True, {"invalid": True}
 
         # Apply move
-        self.board[action] = player
+        self.history.append(action)
+        if player == 1:
+            self.x |= bit
+            self.key ^= X_KEYS[action]
+            mine = self.x
+        else:
+            self.o |= bit
+            self.key ^= O_KEYS[action]
+            mine = self.o
 
         # Check terminal conditions
-        if self._check_win(player):
+        if IS_WIN[mine]:
             self.done = True
             self.winner = player
             return self._get_state(), 1, True, {"winner": player}
 
-        if self._check_draw():
+        if self.x | self.o == FULL:
             self.done = True
             self.winner = 0
             return self._get_state(), 0, True, {"draw": True}
@@ -62,44 +154,114 @@ class TicTacToeEnv:
         # Non-terminal move
         return self._get_state(), 0, False, {}
 
+    def push(self, action: int, player: int):
+        """
+        Play `player` at the empty cell `action` of an unfinished game, in
+        place and without validation, and update done / winner. Undo with
+        pop().
+        """
+        self.history.append(action)
+        if player == 1:
+            self.x |= 1 << action
+            self.key ^= X_KEYS[action]
+            won = IS_WIN[self.x]
+        else:
+            self.o |= 1 << action
+            self.key ^= O_KEYS[action]
+            won = IS_WIN[self.o]
+
+        if won:
+            self.done = True
+            self.winner = player
+        elif self.x | self.o == FULL:
+            self.done = True
+            self.winner = 0
+
+    def pop(self) -> int:
+        """
+        Take back the last push() or step(); returns its cell. Both only
+        play into unfinished games, so the game is unfinished again.
+        """
+        action = self.history.pop()
+        bit = 1 << action
+        if self.x & bit:
+            self.x ^= bit
+            self.key ^= X_KEYS[action]
+        else:
+            self.o ^= bit
+            self.key ^= O_KEYS[action]
+        self.done = False
+        self.winner = None
+        return action
+
     # ── Helpers ─────────────────────────────────────────────────────────────
 
+    @property
+    def board(self):
+        """List view of the board (1 / -1 / 0 per cell)."""
+        return list(bits_to_state(self.x, self.o))
+
+    @board.setter
+    def board(self, cells):
+        self.set_bits(*state_to_bits(cells))
+
+    def set_bits(self, x: int, o: int):
+        """Set the bitboards directly (done / winner / history are left alone)."""
+        self.x = x
+        self.o = o
+        key = 0
+        for cell in MOVES[x]:
+            key ^= X_KEYS[cell]
+        for cell in MOVES[o]:
+            key ^= O_KEYS[cell]
+        self.key = key
+
+    @property
+    def move_count(self) -> int:
+        """Stones on the board (the bitboards make this a popcount)."""
+        return (self.x | self.o).bit_count()
+
     def available_actions(self):
         """Return a list of valid move indices."""
-        return [i for i, v in enumerate(self.board) if v == 0]
+        return list(MOVES[FULL ^ (self.x | self.o)])
 
     def _get_state(self):
         """Return a hashable state representation."""
-        return tuple(self.board)
+        return bits_to_state(self.x, self.o)
 
     def _check_win(self, player: int) -> bool:
         """Check if `player` has won."""
-        wins = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),  # cols
-            (0, 4, 8), (2, 4, 6),             # diagonals
-        ]
-        return any(
-            self.board[a] == self.board[b] == self.board[c] == player
-            for a, b, c in wins
-        )
+        return IS_WIN[self.x if player == 1 else self.o]
 
     def _check_draw(self) -> bool:
         """Draw if board full and no winner."""
-        return all(v != 0 for v in self.board)
+        return self.x | self.o == FULL
+
+    def winning_line(self, player: int):
+        """Cells of a line completed by `player`, or None."""
+        bits = self.x if player == 1 else self.o
+        for mask in WIN_MASKS:
+            if bits & mask == mask:
+                return MOVES[mask]
+        return None
 
     # ── Rendering ───────────────────────────────────────────────────────────
 
     def render(self):
         """Print the board."""
         symbols = {1: "X", -1: "O", 0: "."}
+        board = self._get_state()
         for i in range(0, 9, 3):
-            row = " ".join(symbols[self.board[i + j]] for j in range(3))
+            row = " ".join(symbols[board[i + j]] for j in range(3))
             print(row)
         print()
+
     def clone(self):
-        new_env = TicTacToeEnv()
-        new_env.board = self.board.copy()
+        new_env = TicTacToeEnv.__new__(TicTacToeEnv)
+        new_env.x = self.x
+        new_env.o = self.o
+        new_env.key = self.key
         new_env.done = self.done
         new_env.winner = self.winner
-        return new_env
\ No newline at end of file
+        new_env.history = self.history.copy()
+        return new_env
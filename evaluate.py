@@ -1,36 +1,52 @@
 # evaluate.py
 
+import argparse
+import os
 import random
+import time
+
+import numpy as np
+
+import solver
 from env import TicTacToeEnv
 from agent import QLearningAgent
+from batch_env import BatchTicTacToeEnv
+from gamelog import GameLogWriter
+from registry import AGENTS, as_policy, make_agent
+
 
+def play_vs_random(agent, games: int = 1_000, log=None):
+    """
+    Play `agent` as X against a uniform-random O.
 
-def play_vs_random(agent: QLearningAgent, games: int = 1_000):
+    agent: a trained QLearningAgent (played greedily) or any registry
+           agent with select_move(env)
+    log:   optional gamelog.GameLogWriter recording every game
+    """
     env = TicTacToeEnv()
+    policy = as_policy(agent, player=1)
 
     results = {"win": 0, "loss": 0, "draw": 0}
 
     for _ in range(games):
-        state = env.reset()
+        env.reset()
         done = False
         player = 1  # agent is X
 
         while not done:
-            available_actions = env.available_actions()
-
             if player == 1:
                 # Agent move (pure exploitation — no exploration)
-                action = max(
-                    available_actions,
-                    key=lambda a: agent.Q[state][a]
-                )
+                action = policy.select_move(env)
             else:
                 # Random opponent
-                action = random.choice(available_actions)
+                action = random.choice(env.available_actions())
 
-            state, reward, done, _ = env.step(action, player)
+            _, _, done, _ = env.step(action, player)
             player = -player
 
+        if log is not None:
+            log.write(env.history, env.winner)
+
         # Record result (from agent perspective)
         if env.winner == 1:
             results["win"] += 1
@@ -42,14 +58,191 @@ def play_vs_random(agent: QLearningAgent, games: int = 1_000):
     return results
 
 
+def play_vs_random_batch(
+    agent: QLearningAgent,
+    games: int = 1_000,
+    batch_size: int = 1_000,
+    seed=None,
+):
+    """
+    play_vs_random() on a BatchTicTacToeEnv: up to `batch_size` games run
+    together and random opponent moves are sampled for all of them at once.
+    """
+    results = {"win": 0, "loss": 0, "draw": 0}
+    rng = np.random.default_rng(seed)
+
+    remaining = games
+    while remaining:
+        n = min(batch_size, remaining)
+        env = BatchTicTacToeEnv(n, auto_reset=False, seed=rng)
+
+        while not env.done.all():
+            actions = env.random_actions()
+            for g in np.nonzero((env.to_move == 1) & ~env.done)[0].tolist():
+                # Agent move (pure exploitation — no exploration)
+                state = tuple(env.boards[g].tolist())
+                available_actions = [i for i, v in enumerate(state) if v == 0]
+                q_values = agent.q_values(state)
+                actions[g] = max(
+                    available_actions,
+                    key=lambda a: q_values[a]
+                )
+            env.step(actions)
+
+        # Record results (from agent perspective)
+        results["win"] += int((env.winner == 1).sum())
+        results["loss"] += int((env.winner == -1).sum())
+        results["draw"] += int((env.winner == 0).sum())
+        remaining -= n
+
+    return results
+
+
+# ── Exact evaluation ────────────────────────────────────────────────────────
+
+def _exact(agent, agent_player: int, opponent):
+    """
+    Exact outcome probabilities of `agent` against `opponent`, by one
+    memoized pass over the game tree.
+
+    opponent(env, player) -> [(move, probability), ...]
+
+    The agent's moves come from its move_distribution(env) if it has one;
+    otherwise it must be deterministic (see registry.py) and its move is
+    asked for once per position.
+    """
+    policy = as_policy(agent, agent_player)
+    if hasattr(policy, "move_distribution"):
+        agent_moves = policy.move_distribution
+    elif getattr(policy, "deterministic", False):
+        def agent_moves(env):
+            return [(policy.select_move(env), 1.0)]
+    else:
+        raise ValueError(
+            f"{type(policy).__name__} has no move_distribution(env) and is "
+            "not deterministic, so its exact results are undefined"
+        )
+    memo = {}
+
+    def outcome(env, player):
+        """(win, loss, draw) probabilities from the agent's point of view."""
+        key = (env.x, env.o)
+        result = memo.get(key)
+        if result is not None:
+            return result
+
+        if player == agent_player:
+            branches = agent_moves(env)
+        else:
+            branches = opponent(env, player)
+
+        win = loss = draw = 0.0
+        for move, p in branches:
+            child = env.clone()
+            child.step(move, player)
+            if child.done:
+                if child.winner == agent_player:
+                    win += p
+                elif child.winner == 0:
+                    draw += p
+                else:
+                    loss += p
+            else:
+                w, l, d = outcome(child, -player)
+                win += p * w
+                loss += p * l
+                draw += p * d
+
+        result = memo[key] = (win, loss, draw)
+        return result
+
+    win, loss, draw = outcome(TicTacToeEnv(), 1)
+    return {"win": win, "loss": loss, "draw": draw}
+
+
+def _random_opponent(env, player):
+    moves = env.available_actions()
+    return [(move, 1 / len(moves)) for move in moves]
+
+
+def _optimal_opponent(env, player):
+    mine, theirs = (env.x, env.o) if player == 1 else (env.o, env.x)
+    moves = solver.load().optimal_moves(mine, theirs)
+    return [(move, 1 / len(moves)) for move in moves]
+
+
+def exact_vs_random(agent, agent_player: int = 1):
+    """
+    Exact win / loss / draw probabilities of `agent` against a
+    uniform-random opponent; the noise-free version of play_vs_random().
+
+    agent: a trained QLearningAgent (played greedily) or any registry
+           agent that is deterministic or has move_distribution(env),
+           playing as `agent_player`
+    """
+    return _exact(agent, agent_player, _random_opponent)
+
+
+def exact_vs_optimal(agent, agent_player: int = 1):
+    """
+    Exact win / loss / draw probabilities of `agent` against a perfect
+    opponent that picks uniformly among its optimal moves (from the
+    solver table). A perfect agent scores a draw probability of 1.
+    """
+    return _exact(agent, agent_player, _optimal_opponent)
+
+
 if __name__ == "__main__":
-    # Train first
-    from train import train
+    parser = argparse.ArgumentParser(description="Evaluate an agent vs random.")
+    parser.add_argument("--agent", default="Q-Learning", choices=list(AGENTS))
+    parser.add_argument(
+        "--model", default="q_agent.bin",
+        help="saved Q-agent to evaluate; trained and written here if missing",
+    )
+    parser.add_argument(
+        "--symmetric", action="store_true",
+        help="train with symmetry-reduced states if the model is missing",
+    )
+    parser.add_argument(
+        "--exact", action="store_true",
+        help="compute exact probabilities vs random and optimal opponents "
+             "instead of sampling 1,000 games",
+    )
+    parser.add_argument(
+        "--log", metavar="DIR", default=None,
+        help="record the sampled games in DIR (gamelog.py)",
+    )
+    args = parser.parse_args()
+
+    if args.agent != "Q-Learning":
+        agent = make_agent(args.agent, 1)
+    elif os.path.exists(args.model):
+        agent = QLearningAgent.load(args.model)
+        print(f"Loaded {args.model} ({agent.episodes} episodes)")
+    else:
+        # Train first
+        from train import train
+
+        agent, _ = train(episodes=100_000, symmetric=args.symmetric, both_roles=True)
+        agent.save(args.model)
 
-    agent, _ = train(episodes=50_000)
+    if args.exact:
+        for label, evaluate in (("Random", exact_vs_random), ("Optimal", exact_vs_optimal)):
+            start = time.perf_counter()
+            results = evaluate(agent)
+            elapsed = time.perf_counter() - start
+            print(f"Exact evaluation vs {label} Opponent ({elapsed * 1e3:.1f} ms)")
+            print(f"Wins:  {results['win']:.4%}")
+            print(f"Losses:{results['loss']:.4%}")
+            print(f"Draws: {results['draw']:.4%}")
+        raise SystemExit
 
     # Evaluate
-    results = play_vs_random(agent, games=1_000)
+    if args.log:
+        with GameLogWriter(args.log, prefix="evaluate") as log:
+            results = play_vs_random(agent, games=1_000, log=log)
+    else:
+        results = play_vs_random(agent, games=1_000)
 
     total = sum(results.values())
     print("Evaluation vs Random Opponent")
@@ -0,0 +1,217 @@
+# gamelog.py
+
+"""
+Append-only binary log of played games.
+
+A log is a directory of files `<prefix>-<n>.games`. Each file starts
+with an 8-byte header (magic, version, board cells) followed by one
+record per game:
+
+    1 byte   bits 0-3: number of moves
+             bits 4-5: outcome (0 unfinished, 1 X won, 2 O won, 3 draw)
+             bit 6:    set if O moved first
+    n bytes  the moves, two cells per byte with the earlier move in the
+             high nibble (ceil(moves / 2) bytes)
+
+so a full Tic-Tac-Toe game takes 6 bytes. GameLogWriter buffers records
+in memory, writes them out every `flush_every` games or `flush_seconds`
+and moves on to a new file once the current one passes `max_bytes`.
+read_games() streams the records back in order, one game at a time.
+
+    python gamelog.py logs/          # game count and outcomes of a log
+"""
+
+import argparse
+import glob
+import os
+import struct
+import time
+
+MAGIC = b"TTTG"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")    # magic, version, board cells
+SUFFIX = ".games"
+
+# Outcome field of the record header
+OUTCOMES = {None: 0, 1: 1, -1: 2, 0: 3}
+WINNERS = (None, 1, -1, 0)
+
+O_FIRST = 0x40
+
+READ_CHUNK = 1 << 20
+
+# _NIBBLES[byte] -> (high, low): the two moves packed in a byte
+_NIBBLES = tuple((byte >> 4, byte & 15) for byte in range(256))
+
+
+def encode_game(moves, winner, first: int = 1) -> bytearray:
+    """
+    One record: `moves` (cells 0-15, at most 15 of them), `winner`
+    (1 / -1 / 0, None if unfinished) and the `first` player.
+    """
+    n = len(moves)
+    if n > 15:
+        raise ValueError(f"a record holds at most 15 moves, got {n}")
+    record = bytearray((n | OUTCOMES[winner] << 4 | (O_FIRST if first == -1 else 0),))
+    for i in range(0, n - 1, 2):
+        record.append(moves[i] << 4 | moves[i + 1])
+    if n % 2:
+        record.append(moves[-1] << 4)
+    return record
+
+
+class GameLogWriter:
+    """
+    Buffered writer of game records. Every writer starts a new file in
+    `directory`, numbered after the existing ones, so files are never
+    rewritten. Use as a context manager or call close() to write out the
+    last buffered games.
+    """
+
+    def __init__(self, directory: str, prefix: str = "games",
+                 max_bytes: int = 64 << 20, flush_every: int = 10_000,
+                 flush_seconds: float = 5.0, cells: int = 9):
+        # Moves are stored as nibbles and counted in 4 bits
+        if not 0 < cells <= 15:
+            raise ValueError(f"game logs support boards of at most 15 cells, got {cells}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.cells = cells
+
+        self.games = 0       # games written by this writer
+        self.files = []      # paths written, in order
+
+        self._buffer = bytearray()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._index = len(log_files(directory, prefix))
+        self._file = None
+        self._open()
+
+    def write(self, moves, winner, first: int = 1):
+        """Append one game (see encode_game)."""
+        self._buffer += encode_game(moves, winner, first)
+        self._pending += 1
+        self.games += 1
+        if self._pending >= self.flush_every \
+                or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def write_env(self, env):
+        """
+        Append the game played so far in a TicTacToeEnv (moves from
+        env.history).
+        """
+        moves = env.history
+        first = env.board[moves[0]] if moves else 1
+        self.write(moves, env.winner if env.done else None, first)
+
+    def flush(self):
+        """Write the buffered games to disk, rotating first if needed."""
+        if self._size > HEADER.size and self._size + len(self._buffer) > self.max_bytes:
+            self._file.close()
+            self._index += 1
+            self._open()
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._size += len(self._buffer)
+        self._buffer.clear()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        # Skip past any file of this number left by another writer
+        while os.path.exists(path := self._path(self._index)):
+            self._index += 1
+        self._file = open(path, "xb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.cells))
+        self._size = HEADER.size
+        self.files.append(path)
+
+    def _path(self, index):
+        return os.path.join(self.directory, f"{self.prefix}-{index:06d}{SUFFIX}")
+
+
+def log_files(path: str, prefix: str = None):
+    """The log files of a directory in write order, or [path] for a file."""
+    if os.path.isfile(path):
+        return [path]
+    pattern = f"{prefix or '*'}-*{SUFFIX}"
+    return sorted(glob.glob(os.path.join(glob.escape(path), pattern)))
+
+
+def read_games(path: str, prefix: str = None):
+    """
+    Yield (moves, winner, first) for every game in a log file or
+    directory, reading one chunk at a time. `moves` is a tuple of cells;
+    `winner` is 1 / -1 / 0, or None for an unfinished game. A record cut
+    short at the end of a file (a writer that was killed) is skipped.
+    """
+    for name in log_files(path, prefix):
+        with open(name, "rb") as f:
+            magic, version, _ = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{name}: not a game log (version {VERSION})")
+
+            data = b""
+            while chunk := f.read(READ_CHUNK):
+                data += chunk
+                end = len(data)
+                i = 0
+                while i < end:
+                    header = data[i]
+                    n = header & 15
+                    size = (n + 3) >> 1
+                    if i + size > end:
+                        break
+                    moves = ()
+                    for byte in data[i + 1:i + size]:
+                        moves += _NIBBLES[byte]
+                    yield (
+                        moves[:n],
+                        WINNERS[header >> 4 & 3],
+                        -1 if header & O_FIRST else 1,
+                    )
+                    i += size
+                data = data[i:]
+
+
+def summarize(path: str):
+    """Game count and outcome counts of a log, in one streaming pass."""
+    counts = {"games": 0, "x_wins": 0, "o_wins": 0, "draws": 0, "unfinished": 0}
+    keys = {1: "x_wins", -1: "o_wins", 0: "draws", None: "unfinished"}
+    for _, winner, _ in read_games(path):
+        counts["games"] += 1
+        counts[keys[winner]] += 1
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a game log.")
+    parser.add_argument("path", help="log directory or file")
+    args = parser.parse_args()
+
+    size = sum(os.path.getsize(name) for name in log_files(args.path))
+    start = time.perf_counter()
+    counts = summarize(args.path)
+    elapsed = time.perf_counter() - start
+    for key, value in counts.items():
+        print(f"{key:>10}: {value:,}")
+    print(f"{size / 1e6:.1f} MB read in {elapsed:.2f} s "
+          f"({counts['games'] / elapsed:,.0f} games/s)")
@@ -0,0 +1,225 @@
+# mcts.py
+
+import math
+import sys
+import time
+
+import numpy as np
+
+from search import candidate_moves
+
+
+class Node:
+    """
+    One search-tree node. `player` made `move` to reach it; `wins` counts
+    rollouts won by `player` (draws count half).
+    """
+
+    __slots__ = ("move", "player", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, player, parent, untried):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+
+def batch_rollouts(board, lines, player: int, batch_size: int, rng):
+    """
+    Play `batch_size` uniformly random games to the end from `board`
+    (with `player` to move) in one vectorized pass. Returns an int8 array
+    of winners (1 / -1 / 0).
+
+    Every rollout fills all empty cells in a random order with alternating
+    stones. A line is won by the side owning all of its cells, at the time
+    its last cell was filled, and the rollout goes to whichever side
+    completed a line first.
+    """
+    board = np.asarray(board, dtype=np.int8)
+    empty = np.flatnonzero(board == 0)
+
+    # Play time of every empty cell; existing stones count as time -1
+    order = rng.random((batch_size, len(empty))).argsort(1).argsort(1)
+    times = np.full((batch_size, len(board)), -1, dtype=np.int16)
+    times[:, empty] = order
+    owners = np.broadcast_to(board, (batch_size, len(board))).copy()
+    owners[:, empty] = np.where(order % 2 == 0, player, -player)
+
+    line_owners = owners[:, lines]                      # (B, lines, k)
+    line_times = times[:, lines].max(2)                 # (B, lines)
+    never = np.int16(len(board))
+    x_time = np.where((line_owners == 1).all(2), line_times, never).min(1)
+    o_time = np.where((line_owners == -1).all(2), line_times, never).min(1)
+
+    winners = np.zeros(batch_size, dtype=np.int8)
+    winners[x_time < o_time] = 1
+    winners[o_time < x_time] = -1
+    return winners
+
+
+class MCTSAgent:
+    """
+    Monte Carlo Tree Search with UCT selection and batched random rollouts.
+
+    The subtree under the move actually played is kept between calls and
+    reused when the opponent's reply is already in the tree.
+
+    iterations:  tree iterations per move (default 1000 when no budget)
+    time_budget: seconds per move; stops at whichever limit comes first
+    batch_size:  rollouts per expanded leaf, run together with NumPy
+    c:           UCT exploration constant
+    radius:      on boards larger than 3x3, only cells within this
+                 distance of a stone are expanded
+    seed:        seeds the rollouts and the expansion order, so a seeded
+                 agent plays the same moves every run
+    """
+
+    def __init__(self, agent_player, iterations: int = None,
+                 time_budget: float = None, batch_size: int = 16,
+                 c: float = 1.4, radius: int = 2, seed=None):
+        """
+        agent_player: +1 or -1
+        """
+        self.agent_player = agent_player
+        self.name = "MCTSAgent"
+        if iterations is None and time_budget is None:
+            iterations = 1_000
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.batch_size = batch_size
+        self.c = c
+        self.radius = radius
+        self.rng = np.random.default_rng(seed)
+
+        self._root = None
+        self._root_board = None
+
+        # Stats of the last select_move call
+        self.stats = {}
+
+    def select_move(self, env):
+        root = self._reuse_root(env)
+        lines = np.asarray(env.lines)
+        limit = self.iterations or math.inf
+        self._created = 0
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget else math.inf
+        iterations = 0
+        while True:
+            self._iterate(root, env, lines)
+            iterations += 1
+            if iterations >= limit or time.perf_counter() >= deadline:
+                break
+        elapsed = time.perf_counter() - start
+
+        best = max(root.children, key=lambda child: child.visits)
+
+        self.stats = {
+            "iterations": iterations,
+            "nodes_created": self._created,
+            "nodes_per_sec": self._created / elapsed,
+            "rollouts_per_sec": iterations * self.batch_size / elapsed,
+            "bytes_per_node": self._bytes_per_node(root),
+        }
+
+        # Keep the chosen subtree for the next call
+        best.parent = None
+        self._root = best
+        board = list(env.board)
+        board[best.move] = self.agent_player
+        self._root_board = board
+        return best.move
+
+    # ── Tree ────────────────────────────────────────────────────────────────
+
+    def _moves(self, env):
+        if env.m * env.n <= 9:
+            return env.available_actions()
+        return candidate_moves(env, self.radius)
+
+    def _new_root(self, env):
+        moves = self._moves(env)
+        self.rng.shuffle(moves)
+        return Node(None, -self.agent_player, None, moves)
+
+    def _reuse_root(self, env):
+        """
+        Return the kept subtree if `env` is its position, or the position
+        one opponent move later; otherwise a fresh root.
+        """
+        root, board = self._root, self._root_board
+        current = env.board
+        if root is None or len(board) != len(current):
+            return self._new_root(env)
+
+        diff = [i for i, (a, b) in enumerate(zip(board, current)) if a != b]
+        if not diff:
+            return root
+        if len(diff) == 1 and board[diff[0]] == 0 \
+                and current[diff[0]] == -self.agent_player:
+            for child in root.children:
+                if child.move == diff[0]:
+                    child.parent = None
+                    return child
+        return self._new_root(env)
+
+    def _iterate(self, root, env, lines):
+        node = root
+        sim = env.clone()
+
+        # Selection
+        while not node.untried and node.children:
+            log_n = math.log(node.visits)
+            node = max(
+                node.children,
+                key=lambda child: child.wins / child.visits
+                + self.c * math.sqrt(log_n / child.visits),
+            )
+            sim.step(node.move, node.player)
+
+        # Expansion
+        if node.untried and not sim.done:
+            move = node.untried.pop()
+            player = -node.player
+            sim.step(move, player)
+            untried = [] if sim.done else self._moves(sim)
+            self.rng.shuffle(untried)
+            child = Node(move, player, node, untried)
+            node.children.append(child)
+            node = child
+            self._created += 1
+
+        # Simulation
+        batch = self.batch_size
+        if sim.done:
+            x_wins = batch if sim.winner == 1 else 0
+            o_wins = batch if sim.winner == -1 else 0
+        else:
+            winners = batch_rollouts(sim.board, lines, -node.player, batch, self.rng)
+            x_wins = int((winners == 1).sum())
+            o_wins = int((winners == -1).sum())
+        draws = batch - x_wins - o_wins
+
+        # Backpropagation
+        while node is not None:
+            node.visits += batch
+            node.wins += (x_wins if node.player == 1 else o_wins) + 0.5 * draws
+            node = node.parent
+
+    @staticmethod
+    def _bytes_per_node(root):
+        """
+        Average size of the root and its children, including their child
+        and move lists (ints are shared small objects and not counted).
+        """
+        nodes = [root] + root.children
+        total = sum(
+            sys.getsizeof(node) + sys.getsizeof(node.children)
+            + sys.getsizeof(node.untried)
+            for node in nodes
+        )
+        return total / len(nodes)
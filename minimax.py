@@ -1,54 +1,203 @@
 # minimax.py
 
 import math
+from collections import OrderedDict
+
+from env import FULL, IS_WIN, MOVES
+from symmetry import INVERSE, SYMMETRIES, canonical
+
+# Kind of value held by a table entry, as alpha-beta may stop early
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Static move preference: centre, then corners, then edges
+CELL_PRIORITY = (2, 0, 2, 0, 3, 0, 2, 0, 2)
+
+
+class TranspositionTable:
+    """
+    Cache of searched positions, keyed on the canonical position under
+    the 8 board symmetries plus the side to move.
+
+    Entries are (value, flag, move): the value from X's point of view (see
+    MinimaxAgent._minimax) so one table serves agents playing either side,
+    whether it is exact or a lower / upper bound, and the best move found,
+    as a cell of the canonical board.
+
+    maxsize: None for an unbounded table, otherwise the number of entries
+             kept before the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table = OrderedDict() if maxsize is not None else {}
+
+    def get(self, key):
+        entry = self._table.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.maxsize is not None:
+            self._table.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self._table[key] = entry
+        if self.maxsize is not None and len(self._table) > self.maxsize:
+            self._table.popitem(last=False)
+
+    def clear(self):
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "size": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self):
+        return len(self._table)
+
+
+# Shared by every MinimaxAgent that is not given its own table, so repeated
+# select_move calls (and new agents in the same process) start warm.
+SHARED_TABLE = TranspositionTable()
 
 
 class MinimaxAgent:
-    def __init__(self, agent_player):
+    """
+    Perfect play by alpha-beta search over the full game tree.
+
+    Moves are tried best-first: the transposition table's best move, then
+    immediate wins, then blocks of the opponent's wins, then the rest by
+    history score (how often the move caused a cutoff) and CELL_PRIORITY.
+    """
+
+    # Same position, same move (evaluate.py relies on it)
+    deterministic = True
+
+    def __init__(self, agent_player, table=None):
         """
         agent_player: +1 or -1
+        table: TranspositionTable to use (defaults to SHARED_TABLE)
         """
         self.agent_player = agent_player
         self.name = "MinimaxAgent"
+        self.table = SHARED_TABLE if table is None else table
+        self.history = [0] * 9
+
+        # Positions searched by the last select_move call
+        self.nodes = 0
 
     def select_move(self, env):
+        player = self.agent_player
+        self.nodes = 0
+
+        # One copy per call; the search plays moves on it with push / pop
+        env = env.clone()
         best_score = -math.inf
         best_move = None
+        for move in self._ordered_moves(env, player, None):
+            env.push(move, player)
+            # Values are integers, so this window still scores ties exactly
+            # (they go to the lowest cell, as in the solver) and lets worse
+            # moves stop early
+            if player == 1:
+                score = self._minimax(env, -1, best_score - 1, math.inf)
+            else:
+                score = -self._minimax(env, 1, -math.inf, 1 - best_score)
+            env.pop()
 
-        for move in env.available_actions():
-            env_copy = env.clone()
-            env_copy.step(move, self.agent_player)
-            score = self._minimax(env_copy, maximizing=False)
-
-            if score > best_score:
+            if score > best_score or score == best_score and move < best_move:
                 best_score = score
                 best_move = move
 
         return best_move
 
-    def _minimax(self, env, maximizing):
+    def _minimax(self, env, player, alpha=-math.inf, beta=math.inf):
+        """
+        Value of `env` from X's point of view with `player` to move:
+        winner * (10 - pieces on the final board), 0 for a draw. Quicker
+        wins (and slower losses) score further from zero.
+
+        Fail-soft alpha-beta: a result <= alpha is an upper bound and a
+        result >= beta a lower bound on the true value.
+        """
+        self.nodes += 1
         if env.done:
-            return self._evaluate(env)
+            return env.winner * (10 - (env.x | env.o).bit_count())
 
-        if maximizing:
+        key, symmetry = canonical(env.x, env.o)
+        key = key << 1 | (player == 1)
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            value, flag, move = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER and value >= beta or flag == UPPER and value <= alpha:
+                return value
+            tt_move = SYMMETRIES[symmetry][move]
+
+        alpha0, beta0 = alpha, beta
+        best_move = None
+        if player == 1:
             best = -math.inf
-            for move in env.available_actions():
-                env_copy = env.clone()
-                env_copy.step(move, self.agent_player)
-                best = max(best, self._minimax(env_copy, False))
-            return best
+            for move in self._ordered_moves(env, player, tt_move):
+                env.push(move, player)
+                value = self._minimax(env, -player, alpha, beta)
+                env.pop()
+                if value > best:
+                    best, best_move = value, move
+                    if best > alpha:
+                        alpha = best
+                        if alpha >= beta:
+                            self.history[move] += 1
+                            break
         else:
             best = math.inf
-            for move in env.available_actions():
-                env_copy = env.clone()
-                env_copy.step(move, -self.agent_player)
-                best = min(best, self._minimax(env_copy, True))
-            return best
-
-    def _evaluate(self, env):
-        if env.winner == self.agent_player:
-            return 1     # agent win
-        elif env.winner == -self.agent_player:
-            return -1    # agent loss
+            for move in self._ordered_moves(env, player, tt_move):
+                env.push(move, player)
+                value = self._minimax(env, -player, alpha, beta)
+                env.pop()
+                if value < best:
+                    best, best_move = value, move
+                    if best < beta:
+                        beta = best
+                        if alpha >= beta:
+                            self.history[move] += 1
+                            break
+
+        if best <= alpha0:
+            flag = UPPER
+        elif best >= beta0:
+            flag = LOWER
         else:
-            return 0     # draw
\ No newline at end of file
+            flag = EXACT
+        self.table.put(key, (best, flag, INVERSE[symmetry][best_move]))
+        return best
+
+    def _ordered_moves(self, env, player, tt_move):
+        """Legal moves of `player`, most promising first."""
+        if player == 1:
+            mine, theirs = env.x, env.o
+        else:
+            mine, theirs = env.o, env.x
+        history = self.history
+
+        def priority(move):
+            bit = 1 << move
+            return (
+                move == tt_move,
+                IS_WIN[mine | bit],
+                IS_WIN[theirs | bit],
+                history[move],
+                CELL_PRIORITY[move],
+            )
+
+        return sorted(MOVES[FULL ^ (mine | theirs)], key=priority, reverse=True)
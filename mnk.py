@@ -0,0 +1,207 @@
+# mnk.py
+
+from functools import lru_cache
+
+from zobrist import zobrist_table
+
+
+@lru_cache(maxsize=None)
+def build_lines(m: int, n: int, k: int):
+    """
+    Every run of `k` cells in a row, column or diagonal of an m x n board,
+    as tuples of cell indices (cell = row * n + col).
+    """
+    lines = []
+    for row in range(m):
+        for col in range(n):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + d_row * (k - 1)
+                end_col = col + d_col * (k - 1)
+                if 0 <= end_row < m and 0 <= end_col < n:
+                    lines.append(tuple(
+                        (row + d_row * i) * n + col + d_col * i for i in range(k)
+                    ))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def build_cell_lines(m: int, n: int, k: int):
+    """cell_lines[i] -> indices (into build_lines) of the lines through cell i."""
+    cell_lines = [[] for _ in range(m * n)]
+    for index, line in enumerate(build_lines(m, n, k)):
+        for cell in line:
+            cell_lines[cell].append(index)
+    return tuple(tuple(indices) for indices in cell_lines)
+
+
+class MNKEnv:
+    """
+    m,n,k-game environment: `m` rows, `n` columns, first to get `k` in a
+    row wins. MNKEnv(3, 3, 3) is Tic-Tac-Toe; MNKEnv(15, 15, 5) is
+    gomoku.
+
+    Same API and board encoding as TicTacToeEnv:
+      1  -> X
+     -1  -> O
+      0  -> empty
+    with cells numbered row by row from 0 to m * n - 1.
+
+    The env keeps, for every line, how many stones each side has on it
+    (`x_count`, `o_count`), plus `move_count`. A move updates only the
+    lines through its cell, so a win is one counter reaching `k` and a
+    draw is `move_count == m * n`. push() / pop() play and take back
+    moves in place for search. Change the board only through step / push
+    / pop, or the counters go stale.
+
+    `key` is the position's Zobrist key (zobrist.py), updated by XOR in
+    push / pop: a hashable stand-in for `tuple(board)` that costs O(1)
+    per move instead of O(m * n) per lookup.
+    """
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3):
+        if k > max(m, n):
+            raise ValueError(f"k={k} does not fit on a {m}x{n} board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.lines = build_lines(m, n, k)
+        self.cell_lines = build_cell_lines(m, n, k)
+        self.x_keys, self.o_keys = zobrist_table(m * n)
+        self.reset()
+
+    def reset(self):
+        """Reset the board and return the initial state."""
+        self.board = [0] * (self.m * self.n)
+        self.move_count = 0
+        self.key = 0
+        self.x_count = [0] * len(self.lines)
+        self.o_count = [0] * len(self.lines)
+        self.history = []    # (action, done, winner) before each push
+        self.done = False
+        self.winner = None
+        return self._get_state()
+
+    # ── Core API ────────────────────────────────────────────────────────────
+
+    def step(self, action: int, player: int):
+        """
+        Apply `player`'s move at position `action`.
+
+        Returns:
+            state, reward, done, info
+        """
+        if self.done:
+            raise ValueError("Game is already over.")
+
+        # Invalid move
+        if self.board[action] != 0:
+            self.done = True
+            self.winner = -player
+            return self._get_state(), -1, True, {"invalid": True}
+
+        # Apply move
+        self.push(action, player)
+
+        # Check terminal conditions
+        if self.winner == player:
+            return self._get_state(), 1, True, {"winner": player}
+
+        if self.done:
+            return self._get_state(), 0, True, {"draw": True}
+
+        # Non-terminal move
+        return self._get_state(), 0, False, {}
+
+    def push(self, action: int, player: int):
+        """
+        Play `player` at the empty cell `action` in place, without
+        validation, and update done / winner. Undo with pop().
+        """
+        self.history.append((action, self.done, self.winner))
+        self.board[action] = player
+        self.move_count += 1
+
+        if player == 1:
+            counts = self.x_count
+            self.key ^= self.x_keys[action]
+        else:
+            counts = self.o_count
+            self.key ^= self.o_keys[action]
+        k = self.k
+        won = False
+        for index in self.cell_lines[action]:
+            counts[index] += 1
+            if counts[index] == k:
+                won = True
+
+        if won:
+            self.done = True
+            self.winner = player
+        elif self.move_count == len(self.board):
+            self.done = True
+            self.winner = 0
+
+    def pop(self) -> int:
+        """Take back the last push() or step(); returns its cell."""
+        action, self.done, self.winner = self.history.pop()
+        if self.board[action] == 1:
+            counts = self.x_count
+            self.key ^= self.x_keys[action]
+        else:
+            counts = self.o_count
+            self.key ^= self.o_keys[action]
+        self.board[action] = 0
+        self.move_count -= 1
+        for index in self.cell_lines[action]:
+            counts[index] -= 1
+        return action
+
+    # ── Helpers ─────────────────────────────────────────────────────────────
+
+    def available_actions(self):
+        """Return a list of valid move indices."""
+        return [i for i, v in enumerate(self.board) if v == 0]
+
+    def _get_state(self):
+        """Return a hashable state representation."""
+        return tuple(self.board)
+
+    def _check_win(self, player: int, action: int = None) -> bool:
+        """
+        Check if `player` has won. With `action`, only the lines through
+        that cell are examined.
+        """
+        counts = self.x_count if player == 1 else self.o_count
+        if action is None:
+            return self.k in counts
+        return any(counts[i] == self.k for i in self.cell_lines[action])
+
+    def _check_draw(self) -> bool:
+        """Draw if board full and no winner."""
+        return self.move_count == len(self.board)
+
+    def winning_line(self, player: int):
+        """Cells of a line completed by `player`, or None."""
+        counts = self.x_count if player == 1 else self.o_count
+        for index, count in enumerate(counts):
+            if count == self.k:
+                return self.lines[index]
+        return None
+
+    # ── Rendering ───────────────────────────────────────────────────────────
+
+    def render(self):
+        """Print the board."""
+        symbols = {1: "X", -1: "O", 0: "."}
+        for i in range(0, self.m * self.n, self.n):
+            print(" ".join(symbols[v] for v in self.board[i:i + self.n]))
+        print()
+
+    def clone(self):
+        new_env = MNKEnv.__new__(MNKEnv)
+        new_env.__dict__.update(self.__dict__)
+        new_env.board = self.board.copy()
+        new_env.x_count = self.x_count.copy()
+        new_env.o_count = self.o_count.copy()
+        new_env.history = self.history.copy()
+        return new_env
@@ -0,0 +1,178 @@
+# model_cache.py
+
+"""
+Process-wide cache of trained agents and precomputed tables.
+
+Keys are tuples whose first element names the kind of model, followed by
+the hyperparameters that produced it, e.g.
+
+    ("q-learning", 30_000, 0.5, 0.9, 0.9999, 0.05)
+
+Concurrent requests for a missing key are single-flighted: the first
+caller runs the factory, later callers block on the same Future and get
+the same object. The cache holds at most `maxsize` models and evicts the
+least recently used one.
+
+When `snapshot_dir` is set, models with a `save(path)` method are written
+there after they are built (unless got with persist=False), and `warm()`
+reloads them on startup through the loader registered for their kind.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from agent import QLearningAgent
+
+INDEX = "index.json"
+
+# Next to this file, so every entry point shares it whatever the working
+# directory (override with TTT_MODEL_DIR)
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+
+class ModelCache:
+    def __init__(self, maxsize: int = 8, snapshot_dir: str = None, loaders=None):
+        self.maxsize = maxsize
+        self.snapshot_dir = snapshot_dir
+        self.loaders = {"q-learning": QLearningAgent.load}
+        self.loaders.update(loaders or {})
+
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+
+        self._lock = threading.Lock()
+        self._models = OrderedDict()
+        self._pending = {}
+        self._warmed = False
+
+    # ── Lookup ──────────────────────────────────────────────────────────────
+
+    def get(self, key, factory, persist: bool = True):
+        """
+        Return the model for `key`, calling `factory()` to build it if
+        needed. At most one factory call per key runs at a time.
+
+        persist: snapshot a newly built model; pass False for models
+                 that are loaded from a file already
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key]
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.waits += 1
+
+        if not leader:
+            return pending.result()
+
+        try:
+            model = factory()
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(exc)
+            raise
+
+        with self._lock:
+            self._insert(key, model)
+            del self._pending[key]
+        pending.set_result(model)
+
+        if persist:
+            self._snapshot(key, model)
+        return model
+
+    def peek(self, key):
+        """Return the cached model for `key`, or None, without building it."""
+        with self._lock:
+            return self._models.get(key)
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+    def stats(self):
+        return {
+            "size": len(self._models),
+            "hits": self.hits,
+            "misses": self.misses,
+            "waits": self.waits,
+        }
+
+    def _insert(self, key, model):
+        self._models[key] = model
+        self._models.move_to_end(key)
+        while len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
+
+    # ── Snapshots ───────────────────────────────────────────────────────────
+
+    def warm(self):
+        """Load every snapshot listed in `snapshot_dir` (once per cache)."""
+        with self._lock:
+            if self._warmed or not self.snapshot_dir:
+                return
+            self._warmed = True
+
+        for key, filename in self._read_index().items():
+            loader = self.loaders.get(key[0])
+            if loader is None:
+                continue
+            try:
+                model = loader(os.path.join(self.snapshot_dir, filename))
+            except (OSError, ValueError):
+                continue
+            with self._lock:
+                if key not in self._models:
+                    self._insert(key, model)
+
+    def _snapshot(self, key, model):
+        if not self.snapshot_dir or not hasattr(model, "save"):
+            return
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:12]
+        filename = f"{key[0]}-{digest}.bin"
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            model.save(os.path.join(self.snapshot_dir, filename))
+            with self._lock:
+                index = self._read_index()
+                index[key] = filename
+                self._write_index(index)
+        except OSError:
+            pass
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.snapshot_dir, INDEX)) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {tuple(entry["key"]): entry["file"] for entry in entries}
+
+    def _write_index(self, index):
+        path = os.path.join(self.snapshot_dir, INDEX)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                [{"key": list(key), "file": filename}
+                 for key, filename in index.items()],
+                f, indent=1,
+            )
+        os.replace(tmp, path)
+
+
+# Shared by everything in this process (Streamlit sessions included).
+CACHE = ModelCache(snapshot_dir=os.environ.get("TTT_MODEL_DIR", DEFAULT_SNAPSHOT_DIR))
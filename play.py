@@ -1,25 +1,35 @@
 # play.py
 
+import argparse
+
 from env import TicTacToeEnv
-from minimax import MinimaxAgent
+from mnk import MNKEnv
+from registry import AGENTS, MNK_AGENTS, make_agent
 
 
-def human_vs_agent():
-    env = TicTacToeEnv()
+def human_vs_agent(agent_name: str = "Minimax", mnk=None):
+    """
+    mnk: optional (m, n, k) to play an m,n,k-game instead of 3x3
+    """
+    env = MNKEnv(*mnk) if mnk else TicTacToeEnv()
     env.reset()
+    last = env.m * env.n - 1
 
     # Explicit roles
     HUMAN = -1   # X
     AGENT = 1    # O
 
-    agent = MinimaxAgent(agent_player=AGENT)
+    agent = make_agent(agent_name, AGENT)
 
     print("You are X")
     print("Agent is O")
     print("Board positions:")
-    print("0 1 2")
-    print("3 4 5")
-    print("6 7 8\n")
+    width = len(str(last))
+    for row in range(env.m):
+        print(" ".join(
+            str(row * env.n + col).rjust(width) for col in range(env.n)
+        ))
+    print()
 
     env.render()
 
@@ -32,12 +42,12 @@ def human_vs_agent():
             # ---------- HUMAN MOVE ----------
             while True:
                 try:
-                    action = int(input("Your move (0-8): "))
+                    action = int(input(f"Your move (0-{last}): "))
                     if action in available_actions:
                         break
                     print("Invalid move. Try again.")
                 except ValueError:
-                    print("Please enter a number between 0 and 8.")
+                    print(f"Please enter a number between 0 and {last}.")
         else:
             # ---------- AGENT MOVE ----------
             action = agent.select_move(env)
@@ -57,4 +67,24 @@ def human_vs_agent():
 
 
 if __name__ == "__main__":
-    human_vs_agent()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe against the AI.")
+    parser.add_argument(
+        "--agent", default=None, choices=list(AGENTS),
+        help="opponent engine (default Minimax, or AlphaBeta with --mnk; "
+             "Solved answers from the precomputed table)",
+    )
+    parser.add_argument(
+        "--mnk", metavar="M,N,K",
+        type=lambda text: tuple(int(part) for part in text.split(",")),
+        help="play on an M x N board needing K in a row (e.g. 15,15,5 "
+             "with --agent AlphaBeta)",
+    )
+    args = parser.parse_args()
+
+    agent_name = args.agent or ("AlphaBeta" if args.mnk else "Minimax")
+    if args.mnk and agent_name not in MNK_AGENTS:
+        parser.error(
+            f"--agent {agent_name} only plays 3x3; with --mnk choose from "
+            f"{', '.join(sorted(MNK_AGENTS))}"
+        )
+    human_vs_agent(agent_name=agent_name, mnk=args.mnk)
\ No newline at end of file
@@ -0,0 +1,152 @@
+# qtable.py
+
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from env import NUM_RANKS, rank, state_to_bits
+
+# ── On-disk format ──────────────────────────────────────────────────────────
+#
+# 64-byte little-endian header followed by the raw (rows, 9) float32 array,
+# so the payload can be memory-mapped in place.
+
+MAGIC = b"TTTQ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHddQIII")  # magic, version, flags, alpha, gamma,
+                                       # episodes, rows, states, crc32
+HEADER_SIZE = 64
+
+# Header flags
+SYMMETRIC = 1   # rows hold canonical boards only (symmetry.canonicalize)
+BOTH_ROLES = 2  # trained as the second mover too (train.train(both_roles=True))
+
+
+def state_index(state) -> int:
+    """Row of `state` (a 9-tuple of 1 / -1 / 0) in a DenseQTable."""
+    return rank(*state_to_bits(state))
+
+
+class DenseQTable(dict):
+    """
+    Q-table stored as one contiguous float32 array of shape (3**9, 9),
+    one row per board indexed by base-3 rank.
+
+    Drop-in for the nested defaultdict: `Q[state]` returns the row for
+    `state` as a writable view, so `Q[state][action]` reads and
+    `Q[state][action] = v` writes exactly as before. Unseen states read 0.
+
+    The dict itself only maps each state seen so far to its row, so a
+    repeat lookup is a C-level dict hit. Rows are memoryview slices rather
+    than NumPy views: element access yields plain Python floats and costs
+    about as much as indexing a dict.
+    """
+
+    def __init__(self, values=None):
+        super().__init__()
+        if values is None:
+            values = np.zeros((NUM_RANKS, 9), dtype=np.float32)
+        self.values = values
+        self._flat = memoryview(values).cast("B").cast("f")
+
+    def __missing__(self, state):
+        index = state_index(state)
+        row = self[state] = self._flat[index * 9:index * 9 + 9]
+        return row
+
+    def __reduce__(self):
+        return _restore, (np.array(self.values), list(self))
+
+    @property
+    def visited(self):
+        """Bool array (3**9,) of states looked up so far."""
+        mask = np.zeros(NUM_RANKS, dtype=bool)
+        mask[[state_index(state) for state in self]] = True
+        return mask
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+
+def to_dense(Q) -> DenseQTable:
+    """Return `Q` as a DenseQTable, converting a nested-dict table."""
+    if isinstance(Q, DenseQTable):
+        return Q
+    table = DenseQTable()
+    for state, q_values in Q.items():
+        row = table[state]
+        for action, value in q_values.items():
+            row[action] = value
+    return table
+
+
+def save_table(table: DenseQTable, path: str, alpha: float, gamma: float,
+               episodes: int = 0, symmetric: bool = False,
+               both_roles: bool = False):
+    """Write `table` to `path` atomically (temp file + rename)."""
+    payload = np.ascontiguousarray(table.values, dtype="<f4")
+    flags = (SYMMETRIC if symmetric else 0) | (BOTH_ROLES if both_roles else 0)
+    header = HEADER.pack(
+        MAGIC, VERSION, flags, alpha, gamma, episodes,
+        payload.shape[0], len(table), zlib.crc32(payload),
+    ).ljust(HEADER_SIZE, b"\0")
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(payload.tobytes())
+    os.replace(tmp, path)
+
+
+def load_table(path: str, mmap: bool = True, verify: bool = True):
+    """
+    Read a table written by `save_table`. Returns (DenseQTable, meta).
+
+    With mmap=True the values are a copy-on-write numpy.memmap of the
+    file: nothing is copied up front, processes loading the same file
+    share its page-cached pages, and updates stay private to the process.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated Q-table header")
+    magic, version, flags, alpha, gamma, episodes, rows, states, checksum = (
+        HEADER.unpack_from(header)
+    )
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a Q-table file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported Q-table version {version}")
+    if rows != NUM_RANKS:
+        raise ValueError(f"{path}: expected {NUM_RANKS} rows, found {rows}")
+
+    if mmap:
+        values = np.memmap(
+            path, dtype="<f4", mode="c", offset=HEADER_SIZE, shape=(rows, 9)
+        )
+    else:
+        values = np.fromfile(
+            path, dtype="<f4", offset=HEADER_SIZE, count=rows * 9
+        ).reshape(rows, 9)
+    if verify and zlib.crc32(values) != checksum:
+        raise ValueError(f"{path}: Q-table checksum mismatch")
+
+    meta = {
+        "alpha": alpha,
+        "gamma": gamma,
+        "episodes": episodes,
+        "states": states,
+        "symmetric": bool(flags & SYMMETRIC),
+        "both_roles": bool(flags & BOTH_ROLES),
+    }
+    return DenseQTable(values), meta
+
+
+def _restore(values, states):
+    table = DenseQTable(values)
+    for state in states:
+        table[state]
+    return table
@@ -0,0 +1,192 @@
+# registry.py
+
+"""
+Agent registry shared by app.py, play.py and evaluate.py.
+
+Every entry maps a name to a factory `factory(player, **options)` that
+returns an object with `select_move(env)`. For exact evaluation
+(evaluate.py) an agent either sets `deterministic = True` or provides
+`move_distribution(env) -> [(move, probability), ...]`, the odds with
+which select_move picks each move. Register new engines with
+
+    @register("My Engine")
+    def _my_engine(player, **options):
+        return MyEngine(player, **options)
+
+and they become available to every entry point. Pass mnk=True to
+register() for engines that also play m,n,k-games (MNKEnv); the others
+only know the 3x3 TicTacToeEnv.
+"""
+
+import random
+
+import solver
+from agent import QLearningAgent
+from mcts import MCTSAgent
+from minimax import MinimaxAgent
+from model_cache import CACHE
+from search import AlphaBetaAgent
+from train import train
+
+AGENTS = {}
+MNK_AGENTS = set()    # names of the engines that play on any MNKEnv
+
+
+def register(name: str, mnk: bool = False):
+    """Decorator adding `factory` to the registry under `name`."""
+    def decorator(factory):
+        AGENTS[name] = factory
+        if mnk:
+            MNK_AGENTS.add(name)
+        return factory
+    return decorator
+
+
+def make_agent(name: str, player: int, **options):
+    """Build the registered agent `name` playing as `player` (+1 / -1)."""
+    try:
+        factory = AGENTS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown agent {name!r} (choose from {', '.join(AGENTS)})"
+        ) from None
+    return factory(player, **options)
+
+
+def as_policy(agent, player: int):
+    """Wrap a bare QLearningAgent; pass anything with select_move through."""
+    if hasattr(agent, "select_move"):
+        return agent
+    return QPolicy(agent, player)
+
+
+# ── Adapters ────────────────────────────────────────────────────────────────
+
+class RandomAgent:
+    def __init__(self, agent_player):
+        self.agent_player = agent_player
+        self.name = "RandomAgent"
+
+    def select_move(self, env):
+        return random.choice(env.available_actions())
+
+    def move_distribution(self, env):
+        moves = env.available_actions()
+        return [(move, 1 / len(moves)) for move in moves]
+
+
+class QPolicy:
+    """
+    Greedy (no exploration) play from a trained QLearningAgent.
+
+    Agents are trained as X, so when playing O the board is seen with the
+    colours swapped. Whether the agent opened the game or answers (one
+    stone behind) is a separate role: the second mover's positions are
+    only in tables trained with both_roles=True, and playing that role
+    from any other table raises ValueError.
+
+    Moves of equal value are picked at random, as in training.
+    """
+
+    def __init__(self, agent: QLearningAgent, agent_player: int):
+        self.agent = agent
+        self.agent_player = agent_player
+        self.name = "QPolicy"
+
+    def select_move(self, env):
+        moves = self._best_moves(env)
+        return moves[0] if len(moves) == 1 else random.choice(moves)
+
+    def move_distribution(self, env):
+        moves = self._best_moves(env)
+        return [(move, 1 / len(moves)) for move in moves]
+
+    def _best_moves(self, env):
+        """The available moves of highest Q-value (all of them on a tie)."""
+        state = env._get_state()
+        if self.agent_player == -1:
+            state = tuple(-v for v in state)
+        if sum(state) < 0 and not self.agent.both_roles:
+            raise ValueError(
+                "this Q-agent was only trained to move first; train it with "
+                "both_roles=True to play second"
+            )
+        q_values = self.agent.q_values(state)
+        moves = env.available_actions()
+        best = max(q_values[a] for a in moves)
+        return [a for a in moves if q_values[a] == best]
+
+
+# ── Trained Q-agents ────────────────────────────────────────────────────────
+
+Q_DEFAULTS = {
+    "episodes": 60_000,
+    "alpha": 0.5,
+    "gamma": 0.9,
+    "epsilon_decay": 0.9999,
+    "epsilon_min": 0.05,
+    "draw_reward": 0.5,
+    "symmetric": False,
+    "both_roles": True,
+}
+
+
+def q_agent_key(**params):
+    """ModelCache key for a Q-agent trained with `params` (over Q_DEFAULTS)."""
+    params = {**Q_DEFAULTS, **params}
+    return ("q-learning",) + tuple(params[name] for name in sorted(params))
+
+
+def trained_q_agent(**params) -> QLearningAgent:
+    """Q-agent for `params`, trained once per process (or snapshot)."""
+    params = {**Q_DEFAULTS, **params}
+
+    def build():
+        agent, _ = train(dense=True, **params)
+        agent.epsilon = 0.0
+        return agent
+
+    return CACHE.get(q_agent_key(**params), build)
+
+
+# ── Registered engines ──────────────────────────────────────────────────────
+
+@register("Minimax")
+def _minimax(player, **options):
+    return MinimaxAgent(player, **options)
+
+
+@register("Solved")
+def _solved(player, path: str = solver.DEFAULT_PATH):
+    table = CACHE.get(("solution", path), lambda: solver.load(path))
+    return solver.SolvedAgent(player, table=table)
+
+
+@register("AlphaBeta", mnk=True)
+def _alpha_beta(player, **options):
+    return AlphaBetaAgent(player, **options)
+
+
+@register("MCTS", mnk=True)
+def _mcts(player, **options):
+    return MCTSAgent(player, **options)
+
+
+@register("Q-Learning")
+def _q_learning(player, agent: QLearningAgent = None, model: str = None, **params):
+    """
+    agent: a QLearningAgent to play; model: path of one saved with
+    QLearningAgent.save; otherwise one trained with `params`.
+    """
+    if agent is None and model is not None:
+        agent = CACHE.get(
+            ("q-snapshot", model), lambda: QLearningAgent.load(model), persist=False
+        )
+    if agent is None:
+        agent = trained_q_agent(**params)
+    return QPolicy(agent, player)
+
+
+@register("Random", mnk=True)
+def _random(player):
+    return RandomAgent(player)
@@ -0,0 +1,159 @@
+# replay.py
+
+import numpy as np
+
+from env import NUM_RANKS
+from qtable import state_index
+
+# ILLEGAL[row] -> float32 (9,): 0 for the empty cells of the board at
+# Q-table `row`, -inf for occupied ones; added to Q-values before a max
+_EMPTY = (np.arange(NUM_RANKS)[:, None] // 3 ** np.arange(9) % 3) == 0
+ILLEGAL = np.where(_EMPTY, 0.0, -np.inf).astype(np.float32)
+
+# Sum-tree level searched with one cumsum (2**10 nodes) in prioritized
+# sampling; see ReplayBuffer
+TOP_LEVEL = 10
+
+# Q-table row of each state tuple seen so far
+_ROWS = {}
+
+
+def _row(state) -> int:
+    row = _ROWS.get(state)
+    if row is None:
+        row = _ROWS[state] = state_index(state)
+    return row
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity experience replay for a DenseQTable, stored in
+    preallocated NumPy arrays and overwritten oldest first once full.
+
+    Each transition is kept as the Q-table rows of its state and next
+    state, the action, the reward and whether the next state is terminal
+    (otherwise its legal actions are its empty cells).
+
+    prioritized: sample transitions in proportion to |TD error| ** priority
+                 (new ones get the current maximum so that they are seen
+                 at least once) instead of uniformly. The weights are the
+                 leaves of a sum-tree, so drawing a batch and updating its
+                 weights touch O(batch * log capacity) nodes instead of
+                 the whole buffer.
+    """
+
+    def __init__(self, capacity: int = 50_000, prioritized: bool = False,
+                 priority: float = 0.6, seed=None):
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.priority = priority
+        self.rng = np.random.default_rng(seed)
+
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int32)
+        self.terminal = np.zeros(capacity, dtype=bool)
+
+        self.size = 0
+        self._next = 0
+        self._max_weight = 1.0
+
+        self.weights = None     # |TD error| ** priority (prioritized only)
+        if prioritized:
+            # Sum-tree: node i holds the sum of nodes 2i and 2i + 1 and
+            # the weights are the last `_leaves` nodes. Only the levels
+            # from `_top` (nodes 2**_top to 2**(_top + 1) - 1) down are
+            # maintained: one cumsum over that level replaces the walk
+            # from the root, and costs less than that many NumPy calls
+            self._leaves = 1 << (capacity - 1).bit_length()
+            self._depth = self._leaves.bit_length() - 1
+            self._top = min(self._depth, TOP_LEVEL)
+            self._tree = np.zeros(2 * self._leaves)
+            self._pairs = self._tree.reshape(-1, 2)
+            self.weights = self._tree[self._leaves:self._leaves + capacity]
+            # Leaves changed since the sums above them were last updated
+            # (by add() and learn()); brought up to date once per sample
+            self._stale = []
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, next_available_actions):
+        """
+        Store one transition; same arguments as QLearningAgent.update, so
+        it can stand in for it in train.run_episode(learn=...).
+        """
+        i = self._next
+        self.states[i] = _row(state)
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = _row(next_state)
+        self.terminal[i] = not next_available_actions
+        if self.prioritized:
+            self.weights[i] = self._max_weight
+            self._stale.append(i)
+
+        self._next = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size: int):
+        """Indices of `batch_size` stored transitions, drawn with replacement."""
+        if not self.prioritized:
+            return (self.rng.random(batch_size) * self.size).astype(np.intp)
+        if self._stale:
+            self._update(np.hstack(self._stale))
+            self._stale.clear()
+
+        # Find each point's node on the top level, then walk down, going
+        # right past each left subtree's sum
+        tree = self._tree
+        first = 1 << self._top
+        level = tree[first:2 * first]
+        cumulative = np.cumsum(level)
+        points = self.rng.random(batch_size) * cumulative[-1]
+        node = np.minimum(cumulative.searchsorted(points, "right"), first - 1)
+        points -= cumulative[node] - level[node]
+        node += first
+        for _ in range(self._depth - self._top):
+            node *= 2
+            left = tree[node]
+            right = points >= left
+            points -= left * right
+            node += right
+        return np.minimum(node - self._leaves, self.size - 1)
+
+    def _update(self, indices):
+        """Recompute the sums above the leaves at `indices`."""
+        tree, pairs = self._tree, self._pairs
+        node = indices + self._leaves
+        for _ in range(self._depth - self._top):
+            node >>= 1
+            children = pairs.take(node, 0)
+            tree[node] = children[:, 0] + children[:, 1]
+
+    def learn(self, values, batch_size: int, alpha: float, gamma: float):
+        """
+        One Q-learning step on a sampled minibatch, applied to the
+        (3**9, 9) array `values` (DenseQTable.values) in a single
+        vectorized pass. Transitions drawn more than once in the batch are
+        updated once. Returns the mean |TD error| of the batch.
+        """
+        batch = self.sample(batch_size)
+        states = self.states[batch]
+        actions = self.actions[batch]
+        next_states = self.next_states[batch]
+
+        next_q = (values.take(next_states, 0) + ILLEGAL.take(next_states, 0)).max(1)
+        next_q[self.terminal[batch]] = 0.0
+        target = self.rewards[batch] + gamma * next_q
+        q = values[states, actions]
+        td_error = target - q
+        values[states, actions] = q + alpha * td_error
+
+        if self.prioritized:
+            weights = (np.abs(td_error) + 1e-3) ** self.priority
+            self.weights[batch] = weights
+            self._stale.append(batch)
+            self._max_weight = max(self._max_weight, float(weights.max()))
+        return float(np.abs(td_error).mean())
@@ -0,0 +1,285 @@
+# search.py
+
+import math
+import time
+
+from mnk import MNKEnv
+from zobrist import with_side
+
+WIN_SCORE = 1_000_000
+
+# Transposition-table bounds: the stored score is exact, a lower bound
+# (fail high) or an upper bound (fail low)
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Heuristic weight of an open line holding `count` stones of one side
+LINE_WEIGHTS = tuple(0 if count == 0 else 10 ** (count - 1) for count in range(16))
+
+# LINE_SCORE[x][o]: value for X of a line holding x X stones and o O stones
+LINE_SCORE = tuple(
+    tuple(
+        LINE_WEIGHTS[x] if not o else -LINE_WEIGHTS[o] if not x else 0
+        for o in range(16)
+    )
+    for x in range(16)
+)
+
+
+def candidate_moves(env, radius: int = 2):
+    """
+    Empty cells within `radius` (Chebyshev distance) of a stone, in index
+    order; the centre cell on an empty board.
+    """
+    board = env.board
+    m, n, r = env.m, env.n, radius
+    stones = [i for i, v in enumerate(board) if v != 0]
+    if not stones:
+        return [(m // 2) * n + n // 2]
+
+    seen = set()
+    moves = []
+    for cell in stones:
+        row, col = divmod(cell, n)
+        for nr in range(max(0, row - r), min(m, row + r + 1)):
+            for nc in range(max(0, col - r), min(n, col + r + 1)):
+                i = nr * n + nc
+                if board[i] == 0 and i not in seen:
+                    seen.add(i)
+                    moves.append(i)
+    moves.sort()
+    return moves
+
+
+def _to_table(score, ply):
+    """
+    Store win / loss scores relative to the stored position rather than
+    the root, so an entry stays valid when reached at another ply.
+    """
+    if score > WIN_SCORE - 1_000:
+        return score + ply
+    if score < -(WIN_SCORE - 1_000):
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """Inverse of `_to_table` for a position reached at `ply`."""
+    if score > WIN_SCORE - 1_000:
+        return score - ply
+    if score < -(WIN_SCORE - 1_000):
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move's time budget runs out."""
+
+
+class AlphaBetaAgent:
+    """
+    Iterative-deepening alpha-beta (negamax) search with a heuristic
+    evaluation and a per-move wall-clock budget, for boards where
+    exhaustive search is out of reach.
+
+    Works with any env exposing `board`, `m`, `n` and `k` (MNKEnv,
+    TicTacToeEnv). The search runs on its own MNKEnv copy of the position,
+    playing moves with push / pop and keeping the evaluation up to date
+    from the line counters of the cells that change. Searched positions
+    go into a transposition table keyed by the env's Zobrist key, kept
+    across iterations and moves.
+
+    time_budget: seconds per move; the best move of the deepest fully
+                 searched iteration is played
+    max_depth:   optional cap on the iteration depth (plies)
+    radius:      only cells within this distance of a stone are tried
+    table_size:  the transposition table is cleared between moves once
+                 it holds this many positions
+    """
+
+    def __init__(self, agent_player, time_budget: float = 1.0,
+                 max_depth: int = None, radius: int = 2,
+                 table_size: int = 200_000):
+        """
+        agent_player: +1 or -1
+        """
+        self.agent_player = agent_player
+        self.name = "AlphaBetaAgent"
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.radius = radius
+        self.table_size = table_size
+        self.table = {}
+
+        # Stats of the last select_move call
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def select_move(self, env):
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = time.perf_counter() + self.time_budget
+
+        env = self._search_env(env)
+        if len(self.table) > self.table_size:
+            self.table.clear()
+        self._history = [0] * len(env.board)
+        moves = self._candidates(env)
+        best_move = moves[0]
+        if len(moves) == 1:
+            return best_move
+
+        max_depth = self.max_depth or len(env.available_actions())
+        for depth in range(1, max_depth + 1):
+            try:
+                best_score, moves = self._search_root(env, moves, depth)
+            except SearchTimeout:
+                break
+            best_move = moves[0]
+            self.depth_reached = depth
+            # A forced win or loss was found; deeper search cannot change it
+            if abs(best_score) > WIN_SCORE - 1_000:
+                break
+
+        return best_move
+
+    # ── Search ──────────────────────────────────────────────────────────────
+
+    def _search_root(self, env, moves, depth):
+        """
+        Search every root move to `depth`. Returns the best score and the
+        moves re-ordered best first (the next iteration starts from them).
+        """
+        player = self.agent_player
+        alpha = -math.inf
+        scored = []
+        for move in moves:
+            self._push(env, move, player)
+            score = -self._negamax(env, depth - 1, -math.inf, -alpha, -player, 1)
+            self._pop(env)
+            scored.append((score, move))
+            alpha = max(alpha, score)
+        scored.sort(key=lambda item: -item[0])
+        return scored[0][0], [move for _, move in scored]
+
+    def _negamax(self, env, depth, alpha, beta, player, ply):
+        """Score of `env` for `player` (the side to move)."""
+        self.nodes += 1
+        if self.nodes & 63 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout
+
+        if env.done:
+            # The previous mover (-player) just won, or the board is full
+            return 0 if env.winner == 0 else -(WIN_SCORE - ply)
+        if depth == 0:
+            return self._evaluate(env, player)
+
+        key = with_side(env.key, player)
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            stored_depth, value, flag, tt_move = entry
+            if stored_depth >= depth:
+                value = _from_table(value, ply)
+                if flag == EXACT \
+                        or flag == LOWER and value >= beta \
+                        or flag == UPPER and value <= alpha:
+                    return value
+
+        alpha_orig = alpha
+        best = -math.inf
+        best_move = None
+        for move in self._ordered_moves(env, player, tt_move):
+            self._push(env, move, player)
+            score = -self._negamax(env, depth - 1, -beta, -alpha, -player, ply + 1)
+            self._pop(env)
+            if score > best:
+                best = score
+                best_move = move
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                self._history[move] += depth * depth
+                break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, _to_table(best, ply), flag, best_move)
+        return best
+
+    # ── Position ────────────────────────────────────────────────────────────
+
+    def _search_env(self, env):
+        """MNKEnv copy of `env` with the evaluation of its position."""
+        board = MNKEnv(env.m, env.n, env.k)
+        for cell, v in enumerate(env.board):
+            if v:
+                board.push(cell, v)
+        self._score = sum(
+            LINE_SCORE[x][o] for x, o in zip(board.x_count, board.o_count)
+        )
+        self._deltas = []
+        return board
+
+    def _push(self, env, move, player):
+        """env.push() plus the change in evaluation of the lines through `move`."""
+        x_count, o_count = env.x_count, env.o_count
+        delta = 0
+        if player == 1:
+            for i in env.cell_lines[move]:
+                x, o = x_count[i], o_count[i]
+                delta += LINE_SCORE[x + 1][o] - LINE_SCORE[x][o]
+        else:
+            for i in env.cell_lines[move]:
+                x, o = x_count[i], o_count[i]
+                delta += LINE_SCORE[x][o + 1] - LINE_SCORE[x][o]
+        self._deltas.append(delta)
+        self._score += delta
+        env.push(move, player)
+
+    def _pop(self, env):
+        env.pop()
+        self._score -= self._deltas.pop()
+
+    # ── Heuristics ──────────────────────────────────────────────────────────
+
+    def _evaluate(self, env, player):
+        """
+        Sum over lines still open to one side of LINE_WEIGHTS[stones],
+        positive for `player`. Kept current by _push / _pop.
+        """
+        return self._score * player
+
+    def _candidates(self, env):
+        return candidate_moves(env, self.radius)
+
+    def _ordered_moves(self, env, player, tt_move=None):
+        """
+        Candidate moves, most promising first: the transposition table's
+        best move, immediate wins, then blocks of the opponent's wins, then
+        by history score (cutoffs caused so far, weighted by remaining
+        depth).
+        """
+        if player == 1:
+            mine, theirs = env.x_count, env.o_count
+        else:
+            mine, theirs = env.o_count, env.x_count
+        cell_lines = env.cell_lines
+        threat = env.k - 1
+        history = self._history
+
+        def priority(move):
+            win = block = False
+            for i in cell_lines[move]:
+                if mine[i] == threat and not theirs[i]:
+                    win = True
+                elif theirs[i] == threat and not mine[i]:
+                    block = True
+            return move == tt_move, win, block, history[move]
+
+        moves = self._candidates(env)
+        moves.sort(key=priority, reverse=True)
+        return moves
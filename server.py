@@ -0,0 +1,400 @@
+# server.py
+
+"""
+Asynchronous multi-game server.
+
+Clients talk newline-delimited JSON over TCP, one request per line and
+one response line per request, in order:
+
+    {"op": "new_game", "agent": "Solved", "human": "X"}
+    {"op": "move", "game": 7, "cell": 4}
+    {"op": "state", "game": 7}
+    {"op": "stats"}
+
+Every game response carries the board (9 ints, 1 X / -1 O / 0 empty),
+the side to move, done, winner and the AI's reply (`ai_move`, or null).
+Errors come back as {"ok": false, "error": "..."}.
+
+Sessions live in memory and are evicted after `idle_timeout` seconds
+without a request. AI moves run in a process pool; move requests that
+arrive within one `window` (1 ms by default) are grouped by agent and
+served by a single pool call.
+
+    python server.py [--port 8765] [--workers N] [--window-ms 1]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from env import TicTacToeEnv
+from registry import AGENTS, make_agent
+
+SIDES = {"X": 1, "O": -1, 1: 1, -1: -1}
+
+LINE_LIMIT = 4096    # bytes per request line
+
+
+# ── Worker side ─────────────────────────────────────────────────────────────
+
+_agents = {}
+
+
+def _init_worker():
+    from model_cache import CACHE
+    CACHE.warm()
+
+
+def _ready():
+    return os.getpid()
+
+
+def select_moves(agent_name: str, positions):
+    """
+    Pool task: moves of the registry agent `agent_name` for a batch of
+    (x, o, player) positions. Agents are built once per process.
+    """
+    env = TicTacToeEnv()
+    moves = []
+    for x, o, player in positions:
+        agent = _agents.get((agent_name, player))
+        if agent is None:
+            agent = _agents[agent_name, player] = make_agent(agent_name, player)
+        env.set_bits(x, o)
+        moves.append(agent.select_move(env))
+    return moves
+
+
+# ── Sessions ────────────────────────────────────────────────────────────────
+
+class Session:
+    __slots__ = ("env", "agent", "ai_player", "last_seen", "busy")
+
+    def __init__(self, agent: str, ai_player: int, now: float):
+        self.env = TicTacToeEnv()
+        self.agent = agent
+        self.ai_player = ai_player
+        self.last_seen = now
+        self.busy = False
+
+    @property
+    def to_move(self):
+        if self.env.done:
+            return None
+        return 1 if (self.env.x | self.env.o).bit_count() % 2 == 0 else -1
+
+
+class SessionStore:
+    """
+    Games by integer id, kept in least-recently-used order so that idle
+    eviction only looks at the expired front of the queue.
+    """
+
+    def __init__(self, idle_timeout: float = 600.0):
+        self.idle_timeout = idle_timeout
+        self.evicted = 0
+        self._sessions = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def create(self, agent: str, ai_player: int):
+        game_id = next(self._ids)
+        session = self._sessions[game_id] = Session(agent, ai_player, time.monotonic())
+        return game_id, session
+
+    def get(self, game_id):
+        session = self._sessions.get(game_id)
+        if session is not None:
+            session.last_seen = time.monotonic()
+            self._sessions.move_to_end(game_id)
+        return session
+
+    def discard(self, game_id):
+        self._sessions.pop(game_id, None)
+
+    def evict_idle(self, now: float = None) -> int:
+        """Drop sessions idle for longer than idle_timeout; return the count."""
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        count = 0
+        while self._sessions:
+            game_id, session = next(iter(self._sessions.items()))
+            if session.last_seen > deadline or session.busy:
+                break
+            del self._sessions[game_id]
+            count += 1
+        self.evicted += count
+        return count
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+# ── Batching ────────────────────────────────────────────────────────────────
+
+class MoveBatcher:
+    """
+    Collects AI move requests for `window` seconds after the first one
+    arrives, then sends each agent's positions to the pool as one task.
+    """
+
+    def __init__(self, pool, window: float = 0.001):
+        self.pool = pool
+        self.window = window
+        self.batches = 0
+        self.requests = 0
+        self._pending = defaultdict(list)
+        self._scheduled = False
+
+    async def select_move(self, agent: str, env, player: int) -> int:
+        future = asyncio.get_running_loop().create_future()
+        self._pending[agent].append(((env.x, env.o, player), future))
+        self.requests += 1
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        self._scheduled = False
+        pending, self._pending = self._pending, defaultdict(list)
+        loop = asyncio.get_running_loop()
+        for agent, requests in pending.items():
+            self.batches += 1
+            positions = [position for position, _ in requests]
+            futures = [future for _, future in requests]
+            task = loop.run_in_executor(self.pool, select_moves, agent, positions)
+            task.add_done_callback(lambda done, futures=futures: _resolve(done, futures))
+
+
+def _resolve(done, futures):
+    exc = done.exception()
+    for i, future in enumerate(futures):
+        if future.done():
+            continue
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(done.result()[i])
+
+
+# ── Server ──────────────────────────────────────────────────────────────────
+
+class RequestError(Exception):
+    """A client error, reported back as {"ok": false, "error": ...}."""
+
+
+async def _read_line(reader):
+    """
+    The next request line, b"" at end of stream, or None for a line
+    longer than LINE_LIMIT (which is read and dropped up to its newline).
+    """
+    oversized = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as exc:
+            line = exc.partial
+        except asyncio.LimitOverrunError as exc:
+            await reader.readexactly(exc.consumed)
+            oversized = True
+            continue
+        return None if oversized and line else line
+
+
+class GameServer:
+    def __init__(self, workers: int = None, idle_timeout: float = 600.0,
+                 window: float = 0.001):
+        # Spawned, not forked: a forked worker would inherit open client
+        # sockets and keep them alive after the client disconnects
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(
+            self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        self.store = SessionStore(idle_timeout)
+        self.batcher = MoveBatcher(self.pool, window)
+        self.connections = 0
+        self.ops = {
+            "new_game": self.new_game,
+            "move": self.move,
+            "state": self.state,
+            "stats": self.stats,
+        }
+
+    # ── Endpoints ───────────────────────────────────────────────────────────
+
+    async def new_game(self, agent: str = "Solved", human="X"):
+        if agent not in AGENTS:
+            raise RequestError(f"unknown agent {agent!r}")
+        if type(human) is bool or human not in SIDES:
+            raise RequestError("human must be 'X' or 'O'")
+        game_id, session = self.store.create(agent, -SIDES[human])
+        try:
+            ai_move = await self._ai_turn(session)
+        except Exception:
+            # Don't leave a game behind that waits for a move it can't make
+            self.store.discard(game_id)
+            raise
+        return self._game(game_id, session, ai_move)
+
+    async def move(self, game: int, cell: int):
+        session = self._session(game)
+        if session.busy:
+            raise RequestError("a move is already in progress")
+        if session.to_move != -session.ai_player:
+            raise RequestError("not your turn")
+        if type(cell) is not int or not 0 <= cell < 9 \
+                or (session.env.x | session.env.o) >> cell & 1:
+            raise RequestError(f"illegal move {cell!r}")
+
+        session.env.step(cell, -session.ai_player)
+        try:
+            ai_move = await self._ai_turn(session)
+        except Exception:
+            # Take the move back so the game stays playable
+            session.env.pop()
+            raise
+        return self._game(game, session, ai_move)
+
+    async def state(self, game: int):
+        return self._game(game, self._session(game), None)
+
+    async def stats(self):
+        requests, batches = self.batcher.requests, self.batcher.batches
+        return {
+            "connections": self.connections,
+            "sessions": len(self.store),
+            "evicted": self.store.evicted,
+            "ai_moves": requests,
+            "batches": batches,
+            "mean_batch": requests / batches if batches else 0.0,
+        }
+
+    # ── Helpers ─────────────────────────────────────────────────────────────
+
+    def _session(self, game_id):
+        session = self.store.get(game_id)
+        if session is None:
+            raise RequestError(f"unknown game {game_id!r}")
+        return session
+
+    async def _ai_turn(self, session):
+        if session.to_move != session.ai_player:
+            return None
+        session.busy = True
+        try:
+            move = await self.batcher.select_move(
+                session.agent, session.env, session.ai_player
+            )
+        finally:
+            session.busy = False
+        session.env.step(move, session.ai_player)
+        return move
+
+    @staticmethod
+    def _game(game_id, session, ai_move):
+        env = session.env
+        return {
+            "game": game_id,
+            "board": env.board,
+            "to_move": session.to_move,
+            "done": env.done,
+            "winner": env.winner,
+            "ai_move": ai_move,
+        }
+
+    # ── Transport ───────────────────────────────────────────────────────────
+
+    async def handle(self, request: dict) -> dict:
+        """Dispatch one decoded request and return the response object."""
+        try:
+            op = self.ops.get(request.pop("op", None))
+            if op is None:
+                raise RequestError(f"op must be one of {', '.join(self.ops)}")
+            response = await op(**request)
+        except RequestError as exc:
+            return {"ok": False, "error": str(exc)}
+        except TypeError as exc:
+            return {"ok": False, "error": f"bad arguments: {exc}"}
+        except Exception as exc:
+            # e.g. raised by the agent in a worker; the connection stays up
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        return {"ok": True, **response}
+
+    async def _client(self, reader, writer):
+        self.connections += 1
+        try:
+            while (line := await _read_line(reader)) != b"":
+                if line is None:
+                    response = {"ok": False, "error": f"request longer than {LINE_LIMIT} bytes"}
+                else:
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError
+                    except ValueError:
+                        response = {"ok": False, "error": "request must be a JSON object"}
+                    else:
+                        response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(min(self.store.idle_timeout, 1.0))
+            self.store.evict_idle()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        """Start the workers and listen; returns the asyncio.Server."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)
+        ))
+        self._evictor = asyncio.create_task(self._evict_loop())
+        return await asyncio.start_server(self._client, host, port, limit=LINE_LIMIT)
+
+    def close(self):
+        self._evictor.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def serve(host: str, port: int, **options):
+    server = GameServer(**options)
+    listener = await server.start(host, port)
+    print(f"Serving on {host}:{listener.sockets[0].getsockname()[1]}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Tic-Tac-Toe games over JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="AI worker processes")
+    parser.add_argument("--idle-timeout", type=float, default=600.0,
+                        help="seconds before an idle game is evicted")
+    parser.add_argument("--window-ms", type=float, default=1.0,
+                        help="move batching window")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(
+            args.host, args.port, workers=args.workers,
+            idle_timeout=args.idle_timeout, window=args.window_ms / 1e3,
+        ))
+    except KeyboardInterrupt:
+        pass
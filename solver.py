@@ -0,0 +1,185 @@
+# solver.py
+
+"""
+Full-game solution table for Tic-Tac-Toe.
+
+Every position is stored from the point of view of the side to move
+("mine" vs "theirs"), which makes the table independent of who started.
+Entries are indexed by the base-3 rank of (mine, theirs) and packed into
+one little-endian uint16 each:
+
+    bits 0-8    mask of optimal moves
+    bits 9-10   value for the side to move (1 loss, 2 draw, 3 win, 0 unused)
+    bits 11-14  plies to the end of the game under optimal play
+
+Build the file once with `python solver.py`.
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from env import FULL, IS_WIN, MOVES, NUM_RANKS, rank
+
+MAGIC = b"TTTS"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")  # magic, version, entry count
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solution.bin")
+
+LOSS, DRAW, WIN = 1, 2, 3
+
+
+# ── Build ───────────────────────────────────────────────────────────────────
+
+def _reachable():
+    """All (mine, theirs) positions reachable from the empty board."""
+    layers = [{(0, 0)}]
+    for _ in range(9):
+        nxt = set()
+        for mine, theirs in layers[-1]:
+            if IS_WIN[theirs] or mine | theirs == FULL:
+                continue
+            for move in MOVES[FULL ^ (mine | theirs)]:
+                nxt.add((theirs, mine | 1 << move))
+        layers.append(nxt)
+    return layers
+
+
+def build():
+    """
+    Solve every reachable position by retrograde analysis and return the
+    packed table as a list of ints.
+    """
+    table = [0] * NUM_RANKS
+    layers = _reachable()
+
+    # Deepest layer first: every child is solved before its parent.
+    for layer in reversed(layers):
+        for mine, theirs in layer:
+            if IS_WIN[theirs]:
+                table[rank(mine, theirs)] = LOSS << 9
+                continue
+            if mine | theirs == FULL:
+                table[rank(mine, theirs)] = DRAW << 9
+                continue
+
+            best = None
+            best_mask = 0
+            for move in MOVES[FULL ^ (mine | theirs)]:
+                child = table[rank(theirs, mine | 1 << move)]
+                value = 4 - (child >> 9 & 3)       # flip to our point of view
+                dist = (child >> 11 & 15) + 1
+                # Prefer higher value, then the fastest win / slowest loss
+                score = (value, -dist if value != LOSS else dist)
+                if best is None or score > best:
+                    best, best_mask = score, 1 << move
+                elif score == best:
+                    best_mask |= 1 << move
+
+            value, dist = best
+            table[rank(mine, theirs)] = (
+                best_mask | value << 9 | abs(dist) << 11
+            )
+
+    return table
+
+
+def save(table, path: str = DEFAULT_PATH):
+    """Write `table` atomically to `path`."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table)))
+        f.write(struct.pack(f"<{len(table)}H", *table))
+    os.replace(tmp, path)
+
+
+# ── Lookup ──────────────────────────────────────────────────────────────────
+
+class SolutionTable:
+    """
+    Read-only view of a solution file, memory-mapped so that processes on
+    one host share the page-cached data.
+
+    If `path` is missing or unreadable, the table is built in memory and
+    written out for next time (best effort).
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        try:
+            self._entries = self._map(path)
+        except (OSError, ValueError, struct.error):
+            table = build()
+            try:
+                save(table, path)
+            except OSError:
+                pass
+            self._entries = table
+
+    @staticmethod
+    def _map(path):
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(buf)
+        if magic != MAGIC or version != VERSION or count != NUM_RANKS:
+            raise ValueError(f"{path}: not a version {VERSION} solution file")
+        if len(buf) < HEADER.size + 2 * count:
+            raise ValueError(f"{path}: truncated solution file")
+        if sys.byteorder != "little":
+            raise ValueError("solution files are little-endian")
+        return memoryview(buf)[HEADER.size:HEADER.size + 2 * count].cast("H")
+
+    def entry(self, mine: int, theirs: int):
+        """Return (value, distance, optimal move mask) for the side to move."""
+        packed = self._entries[rank(mine, theirs)]
+        return packed >> 9 & 3, packed >> 11 & 15, packed & FULL
+
+    def optimal_moves(self, mine: int, theirs: int):
+        return MOVES[self._entries[rank(mine, theirs)] & FULL]
+
+
+_shared = {}
+
+
+def load(path: str = DEFAULT_PATH) -> SolutionTable:
+    """Return the process-wide SolutionTable for `path`."""
+    table = _shared.get(path)
+    if table is None:
+        table = _shared[path] = SolutionTable(path)
+    return table
+
+
+class SolvedAgent:
+    """
+    Perfect player backed by the precomputed solution table.
+    Same interface as MinimaxAgent; a move costs one table read.
+    """
+
+    # Same position, same move (evaluate.py relies on it)
+    deterministic = True
+
+    def __init__(self, agent_player, path: str = DEFAULT_PATH, table=None):
+        """
+        agent_player: +1 or -1
+        table: SolutionTable to use (defaults to load(path))
+        """
+        self.agent_player = agent_player
+        self.name = "SolvedAgent"
+        self.table = load(path) if table is None else table
+
+    def select_move(self, env):
+        if self.agent_player == 1:
+            mine, theirs = env.x, env.o
+        else:
+            mine, theirs = env.o, env.x
+        return self.table.optimal_moves(mine, theirs)[0]
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    table = build()
+    save(table, path)
+    solved = sum(1 for packed in table if packed)
+    print(f"Solved {solved} positions -> {path}")
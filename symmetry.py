@@ -0,0 +1,94 @@
+# symmetry.py
+
+"""
+The 8 symmetries of the 3x3 board (4 rotations x optional reflection).
+
+A symmetry is a permutation `perm` with new_board[i] = board[perm[i]].
+`TRANSFORMS[s][bits]` applies symmetry `s` to a 9-bit bitboard.
+"""
+
+from env import TERNARY, bits_to_state, state_to_bits
+
+
+def _rotate(i: int) -> int:
+    """Source cell for a 90° clockwise rotation."""
+    row, col = divmod(i, 3)
+    return (2 - col) * 3 + row
+
+
+def _reflect(i: int) -> int:
+    """Source cell for a left-right mirror."""
+    row, col = divmod(i, 3)
+    return row * 3 + (2 - col)
+
+
+def _build_symmetries():
+    perms = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        perms.append(perm)
+        perms.append(tuple(perm[_reflect(i)] for i in range(9)))
+        perm = tuple(perm[_rotate(i)] for i in range(9))
+    return tuple(perms)
+
+
+SYMMETRIES = _build_symmetries()
+
+TRANSFORMS = tuple(
+    tuple(
+        sum(1 << i for i in range(9) if bits >> perm[i] & 1)
+        for bits in range(512)
+    )
+    for perm in SYMMETRIES
+)
+
+
+def canonical_key(x: int, o: int) -> int:
+    """
+    Smallest 18-bit encoding (x << 9 | o) over all 8 symmetries, so that
+    equivalent positions share one key.
+    """
+    return min(t[x] << 9 | t[o] for t in TRANSFORMS)
+
+
+def canonical(x: int, o: int):
+    """(canonical_key(x, o), index of a symmetry that maps the board onto it)."""
+    return min((t[x] << 9 | t[o], s) for s, t in enumerate(TRANSFORMS))
+
+
+# ── Canonical states (Q-learning) ───────────────────────────────────────────
+#
+# A move at cell `a` of a board appears at cell INVERSE[s][a] of the board
+# transformed by symmetry `s`, and canonical cell `i` maps back to
+# SYMMETRIES[s][i].
+
+INVERSE = tuple(
+    tuple(perm.index(a) for a in range(9)) for perm in SYMMETRIES
+)
+
+_CANONICAL = {}
+
+
+def canonicalize(state):
+    """
+    Return (canonical_state, s) for a 9-tuple board: the symmetry `s` whose
+    image of `state` has the smallest base-3 rank, and that image.
+
+    Results are cached per state, so repeat lookups in a training loop are
+    a single dict hit.
+    """
+    cached = _CANONICAL.get(state)
+    if cached is not None:
+        return cached
+
+    x, o = state_to_bits(state)
+    best = None
+    for s, t in enumerate(TRANSFORMS):
+        tx, to = t[x], t[o]
+        key = TERNARY[tx] + 2 * TERNARY[to]
+        if best is None or key < best[0]:
+            best = (key, s, tx, to)
+    _, s, tx, to = best
+
+    cached = _CANONICAL[state] = (bits_to_state(tx, to), s)
+    return cached
@@ -0,0 +1,201 @@
+# telemetry.py
+
+"""
+Training telemetry for train.train(telemetry=...).
+
+A Telemetry object collects, every `report_every` episodes, one record:
+
+    {"event": "progress", "episode": 20000, "elapsed": 0.823,
+     "episodes_per_sec": 28095.5, "q_states": 2423, "epsilon": 0.3679,
+     "win": 14915, "loss": 3393, "draw": 1692,
+     "sampled": 50, "phase_us": {"choose_action": 8.67, "update": 12.15,
+     "env_step": 5.83, "opponent": 7.15}}
+
+and hands it to every sink: any callable taking the dict, such as
+JsonlSink, which appends it to a JSON-lines file. Phase times are the
+mean microseconds per episode over the episodes sampled since the last
+record; one episode in `sample_every` runs with timers, the rest run
+untimed. With telemetry=None (the default) train() does none of this.
+
+profile="cprofile" or "tracemalloc" captures the episodes in
+`profile_window` (start, stop) and emits one "profile" record with the
+top functions by own time (or lines by allocated bytes); cProfile stats
+are also dumped to `profile_path` if given. A run resumed inside the
+window profiles the rest of it, and a run that ends inside the window
+emits its profile on close(); the record's "episodes" are the ones
+actually captured.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+
+PHASES = ("choose_action", "update", "env_step", "opponent")
+
+
+class JsonlSink:
+    """Append each record to `path` as one JSON line."""
+
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, record: dict):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class Telemetry:
+    """
+    sinks:           callables receiving each record dict
+    sample_every:    time the phases of one episode in this many
+    report_every:    episodes between progress records
+    profile:         None, "cprofile" or "tracemalloc"
+    profile_window:  (start, stop) episodes to capture
+    profile_path:    optional file for the cProfile stats (pstats format)
+    top:             entries kept in a profile record
+    """
+
+    def __init__(self, sinks=(), sample_every: int = 100,
+                 report_every: int = 10_000, profile: str = None,
+                 profile_window=(1_000, 2_000), profile_path: str = None,
+                 top: int = 15):
+        if profile not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"Unknown profiler: {profile!r}")
+        self.sinks = list(sinks)
+        self.sample_every = sample_every
+        self.report_every = report_every
+        self.profile = profile
+        self.profile_window = profile_window
+        self.profile_path = profile_path
+        self.top = top
+
+        # Seconds per phase summed over the sampled episodes, reset at
+        # every progress record
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.sampled = 0
+
+        self._start = self._last_time = time.perf_counter()
+        self._last_episode = 0
+        self._episode = 0
+        self._profiler = None
+        # First episode of the profile being captured, None if not profiling
+        self._profile_from = None
+        self._profiled = False
+
+    def start(self, episode: int = 0):
+        """
+        Restart the clocks as training begins; `episode` episodes are
+        already done (restored from a checkpoint).
+        """
+        self._start = self._last_time = time.perf_counter()
+        self._last_episode = episode
+
+    def emit(self, record: dict):
+        for sink in self.sinks:
+            sink(record)
+
+    def sample(self, episode: int) -> bool:
+        """Whether `episode` (0-based) should run with phase timers."""
+        if episode % self.sample_every:
+            return False
+        self.sampled += 1
+        return True
+
+    def episode_end(self, episode: int, agent, stats: dict):
+        """Call after every episode; `episode` counts episodes done."""
+        self._episode = episode
+        if self.profile is not None:
+            start, stop = self.profile_window
+            if self._profile_from is not None:
+                if episode >= stop:
+                    self._profile_stop(episode)
+            elif not self._profiled and start <= episode < stop:
+                self._profile_start(episode)
+        if episode % self.report_every == 0:
+            self._progress(episode, agent, stats)
+
+    def close(self):
+        if self._profile_from is not None:
+            self._profile_stop(self._episode)
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+    # ── Records ─────────────────────────────────────────────────────────────
+
+    def _progress(self, episode, agent, stats):
+        now = time.perf_counter()
+        sampled = self.sampled
+        self.emit({
+            "event": "progress",
+            "episode": episode,
+            "elapsed": round(now - self._start, 3),
+            "episodes_per_sec": round(
+                (episode - self._last_episode) / (now - self._last_time), 1
+            ),
+            "q_states": len(agent.Q),
+            "epsilon": round(agent.epsilon, 4),
+            **stats,
+            "sampled": sampled,
+            "phase_us": {
+                name: round(seconds / sampled * 1e6, 2) if sampled else None
+                for name, seconds in self.phases.items()
+            },
+        })
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.sampled = 0
+        self._last_episode = episode
+        self._last_time = time.perf_counter()
+
+    # ── Profiling ───────────────────────────────────────────────────────────
+
+    def _profile_start(self, episode):
+        self._profile_from = episode
+        if self.profile == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            tracemalloc.start()
+
+    def _profile_stop(self, episode):
+        record = {
+            "event": "profile", "profiler": self.profile,
+            "episodes": [self._profile_from, episode],
+        }
+        self._profile_from = None
+        self._profiled = True
+        if self.profile == "cprofile":
+            self._profiler.disable()
+            if self.profile_path:
+                self._profiler.dump_stats(self.profile_path)
+            stats = pstats.Stats(self._profiler, stream=io.StringIO())
+            rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])
+            record["top"] = [
+                {
+                    "function": f"{file}:{line}({name})",
+                    "calls": calls,
+                    "tottime": round(tottime, 6),
+                    "cumtime": round(cumtime, 6),
+                }
+                for (file, line, name), (_, calls, tottime, cumtime, _)
+                in rows[:self.top]
+            ]
+            self._profiler = None
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            record["current_bytes"] = current
+            record["peak_bytes"] = peak
+            record["top"] = [
+                {"line": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                for stat in snapshot.statistics("lineno")[:self.top]
+            ]
+        self.emit(record)
@@ -0,0 +1,54 @@
+# test_checkpoint.py
+
+"""
+Checkpoint and resume: training N episodes, then resuming to 2N, ends in
+exactly the state of one uninterrupted 2N-episode run, and restore()
+refuses a run whose settings differ.
+
+    python -m pytest test_checkpoint.py
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from train import train
+
+EPISODES = 3_000
+
+
+def run(episodes, **options):
+    random.seed(0)
+    return train(episodes=episodes, dense=True, epsilon_decay=0.999, **options)
+
+
+@pytest.mark.parametrize("both_roles", [False, True])
+def test_resume_matches_uninterrupted_run(tmp_path, both_roles):
+    full, full_stats = run(2 * EPISODES, both_roles=both_roles)
+
+    run(EPISODES, both_roles=both_roles, checkpoint_dir=tmp_path, checkpoint_every=700)
+    # Reseed, so only the checkpointed random state can make the runs agree
+    random.seed(1)
+    resumed, resumed_stats = train(
+        episodes=2 * EPISODES, dense=True, epsilon_decay=0.999,
+        both_roles=both_roles, checkpoint_dir=tmp_path, resume_from=tmp_path,
+        checkpoint_every=700,
+    )
+
+    assert resumed_stats == full_stats
+    assert resumed.episodes == full.episodes == 2 * EPISODES
+    assert resumed.epsilon == full.epsilon
+    assert np.array_equal(resumed.Q.values, full.Q.values)
+    assert set(resumed.Q) == set(full.Q)
+
+    # The extended chain restores to the same table again
+    again, again_stats = run(2 * EPISODES, both_roles=both_roles, resume_from=tmp_path)
+    assert again_stats == full_stats
+    assert np.array_equal(again.Q.values, full.Q.values)
+
+
+def test_resume_rejects_changed_settings(tmp_path):
+    run(EPISODES, checkpoint_dir=tmp_path)
+    with pytest.raises(ValueError):
+        run(2 * EPISODES, resume_from=tmp_path, draw_reward=0.5)
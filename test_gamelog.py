@@ -0,0 +1,59 @@
+# test_gamelog.py
+
+"""
+GameLogWriter / read_games round trip across flushes and file rotation,
+and the limits of the record format.
+
+    python -m pytest test_gamelog.py
+"""
+
+import random
+
+import pytest
+
+from env import TicTacToeEnv
+from gamelog import GameLogWriter, encode_game, read_games
+
+
+def random_games(count: int, seed: int = 0):
+    """(moves, winner, first) for `count` random games, some unfinished."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        env = TicTacToeEnv()
+        player = first = rng.choice((1, -1))
+        for _ in range(rng.randrange(1, 10)):
+            env.step(rng.choice(env.available_actions()), player)
+            player = -player
+            if env.done:
+                break
+        games.append((tuple(env.history), env.winner if env.done else None, first))
+    return games
+
+
+def test_round_trip(tmp_path):
+    games = random_games(2000) + [((), None, 1)]
+    # Small files and frequent flushes, so records span several files
+    with GameLogWriter(tmp_path, max_bytes=1000, flush_every=37) as writer:
+        for moves, winner, first in games:
+            writer.write(moves, winner, first)
+    assert len(writer.files) > 1
+    assert list(read_games(tmp_path)) == games
+
+
+def test_write_env(tmp_path):
+    env = TicTacToeEnv()
+    for cell, player in ((4, -1), (0, 1), (8, -1)):
+        env.step(cell, player)
+    with GameLogWriter(tmp_path) as writer:
+        writer.write_env(env)
+    assert list(read_games(tmp_path)) == [((4, 0, 8), None, -1)]
+
+
+def test_limits(tmp_path):
+    encode_game(list(range(15)), None)
+    with pytest.raises(ValueError):
+        encode_game(list(range(16)), None)
+    with pytest.raises(ValueError):
+        GameLogWriter(tmp_path, cells=16)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,52 @@
+# test_minimax.py
+
+"""
+MinimaxAgent against the solver: on random positions, with the shared,
+a fresh unbounded and a tiny (LRU-evicting) transposition table, every
+move must be one of the solver's optimal moves.
+
+    python -m pytest test_minimax.py
+"""
+
+import random
+
+import pytest
+
+import solver
+from env import TicTacToeEnv
+from minimax import SHARED_TABLE, MinimaxAgent, TranspositionTable
+
+
+def random_positions(count: int, seed: int = 0):
+    """(env, player to move) for `count` random non-terminal positions."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        env = TicTacToeEnv()
+        player = 1
+        for _ in range(rng.randrange(9)):
+            env.step(rng.choice(env.available_actions()), player)
+            player = -player
+            if env.done:
+                break
+        if not env.done:
+            positions.append((env, player))
+    return positions
+
+
+@pytest.mark.parametrize("table", ["shared", "unbounded", "maxsize=50"])
+def test_moves_are_optimal(table):
+    tables = {
+        "shared": lambda: SHARED_TABLE,
+        "unbounded": TranspositionTable,
+        "maxsize=50": lambda: TranspositionTable(maxsize=50),
+    }
+    solution = solver.load()
+    # Agents keep their tables across positions, so bounds stored by
+    # earlier searches are reused by later ones
+    agents = {player: MinimaxAgent(player, table=tables[table]()) for player in (1, -1)}
+
+    for env, player in random_positions(500):
+        mine, theirs = (env.x, env.o) if player == 1 else (env.o, env.x)
+        move = agents[player].select_move(env)
+        assert move in solution.optimal_moves(mine, theirs), (env.board, player, move)
@@ -0,0 +1,63 @@
+# test_replay.py
+
+"""
+ReplayBuffer sampling: prioritized draws follow the weights (through the
+top-level cumsum alone and through the sum-tree walk below it), stay
+within the stored transitions, and see the weights set by learn().
+
+    python -m pytest test_replay.py
+"""
+
+import numpy as np
+import pytest
+
+from qtable import DenseQTable
+from replay import ReplayBuffer
+
+EMPTY = (0,) * 9
+AFTER = (1,) + (0,) * 8
+
+
+def filled(capacity, size, seed=0):
+    buffer = ReplayBuffer(capacity, prioritized=True, seed=seed)
+    for i in range(size):
+        buffer.add(EMPTY, i % 9, 0.0, AFTER, [1, 2])
+    return buffer
+
+
+@pytest.mark.parametrize("capacity", [600, 5_000])
+def test_sampling_follows_weights(capacity):
+    size = capacity - 100
+    buffer = filled(capacity, size)
+    rng = np.random.default_rng(1)
+    weights = rng.random(size) ** 3
+    buffer.weights[:size] = weights
+    buffer._stale.append(np.arange(size))
+
+    draws = 2_000_000
+    counts = np.bincount(buffer.sample(draws), minlength=capacity)
+    assert counts[size:].sum() == 0
+    expected = weights / weights.sum() * draws
+    # Per-index counts are binomial; allow 5 standard deviations
+    assert np.all(np.abs(counts[:size] - expected) <= 5 * np.sqrt(expected) + 1)
+
+
+def test_sampling_after_learn():
+    buffer = filled(5_000, 4_000)
+    values = DenseQTable().values
+    for _ in range(50):
+        buffer.learn(values, 128, 0.5, 0.9)
+    weights = buffer.weights[:4_000].copy()
+    counts = np.bincount(buffer.sample(1_000_000), minlength=5_000)
+    expected = weights / weights.sum() * 1_000_000
+    assert counts[4_000:].sum() == 0
+    assert np.all(np.abs(counts[:4_000] - expected) <= 5 * np.sqrt(expected) + 1)
+
+
+def test_uniform_stays_within_size():
+    buffer = ReplayBuffer(1_000, seed=0)
+    for i in range(10):
+        buffer.add(EMPTY, i % 9, 0.0, AFTER, [1, 2])
+    counts = np.bincount(buffer.sample(100_000), minlength=1_000)
+    assert counts[10:].sum() == 0
+    assert counts[:10].min() > 9_000
@@ -0,0 +1,68 @@
+# test_server.py
+
+"""
+GameServer request handling, with the worker pool replaced by a stub
+agent (no processes are started).
+
+    python -m pytest test_server.py
+"""
+
+import asyncio
+
+import pytest
+
+from server import GameServer
+
+
+@pytest.fixture
+def server():
+    server = GameServer(workers=1)
+    yield server
+    server.pool.shutdown()
+
+
+def stub_agent(server, move=None):
+    """Make every AI move `move`, or raise if it is None."""
+    async def select_move(agent, env, player):
+        if move is None:
+            raise RuntimeError("agent failed")
+        return move
+    server.batcher.select_move = select_move
+
+
+def request(server, **fields):
+    return asyncio.run(server.handle(fields))
+
+
+def test_failed_ai_move_takes_the_human_move_back(server):
+    game = request(server, op="new_game", human="X")["game"]
+    stub_agent(server, None)
+    response = request(server, op="move", game=game, cell=4)
+    assert response == {"ok": False, "error": "RuntimeError: agent failed"}
+
+    state = request(server, op="state", game=game)
+    assert state["board"] == [0] * 9
+    assert state["to_move"] == 1
+
+    stub_agent(server, 0)
+    response = request(server, op="move", game=game, cell=4)
+    assert response["ok"]
+    assert response["ai_move"] == 0
+    assert response["board"] == [-1, 0, 0, 0, 1, 0, 0, 0, 0]
+
+
+def test_failed_opening_ai_move_drops_the_game(server):
+    stub_agent(server, None)
+    assert not request(server, op="new_game", human="O")["ok"]
+    assert len(server.store) == 0
+
+
+@pytest.mark.parametrize("field, value", [("human", True), ("human", 1.5), ("cell", True)])
+def test_rejects_non_side_and_non_cell_values(server, field, value):
+    stub_agent(server, 0)
+    if field == "human":
+        response = request(server, op="new_game", human=value)
+    else:
+        game = request(server, op="new_game", human="X")["game"]
+        response = request(server, op="move", game=game, cell=value)
+    assert not response["ok"]
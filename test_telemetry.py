@@ -0,0 +1,50 @@
+# test_telemetry.py
+
+"""
+Telemetry profile window: a fresh run, a run resumed inside the window
+and a run that ends inside it each emit exactly one profile record
+covering the episodes actually captured.
+
+    python -m pytest test_telemetry.py
+"""
+
+import random
+
+import pytest
+
+from telemetry import Telemetry
+from train import train
+
+
+def profiles(episodes, profile, **run):
+    records = []
+    telemetry = Telemetry([records.append], report_every=1_000, profile=profile,
+                          profile_window=(1_000, 2_000))
+    random.seed(0)
+    train(episodes=episodes, telemetry=telemetry, **run)
+    return [record for record in records if record["event"] == "profile"]
+
+
+@pytest.mark.parametrize("profile", ["cprofile", "tracemalloc"])
+def test_fresh_run(profile):
+    [record] = profiles(2_500, profile)
+    assert record["episodes"] == [1_000, 2_000]
+    assert record["top"]
+
+
+@pytest.mark.parametrize("profile", ["cprofile", "tracemalloc"])
+def test_resumed_inside_window(tmp_path, profile):
+    profiles(1_500, None, checkpoint_dir=tmp_path, checkpoint_every=500)
+    [record] = profiles(2_500, profile, resume_from=tmp_path)
+    assert record["episodes"] == [1_501, 2_000]
+    assert record["top"]
+
+
+def test_run_ends_inside_window():
+    [record] = profiles(1_500, "cprofile")
+    assert record["episodes"] == [1_000, 1_500]
+
+
+def test_resumed_past_window(tmp_path):
+    profiles(2_000, None, checkpoint_dir=tmp_path, checkpoint_every=500)
+    assert profiles(2_500, "cprofile", resume_from=tmp_path) == []
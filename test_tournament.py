@@ -0,0 +1,69 @@
+# test_tournament.py
+
+"""
+Elo fit on hand-made W/D/L matrices, and a small round robin on a real
+pool: results are mirrored between the two sides of every pairing,
+reproducible for a seed, and the solved player never loses.
+
+    python -m pytest test_tournament.py
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from tournament import ELO_BASE, elo_ratings, parse_entrant, round_robin
+
+
+def test_parse_entrant():
+    assert parse_entrant("Minimax") == ("Minimax", {})
+    assert parse_entrant("MCTS:iterations=200,seed=1") == ("MCTS", {"iterations": 200, "seed": 1})
+    assert parse_entrant("Q-Learning:model=q.bin") == ("Q-Learning", {"model": "q.bin"})
+
+
+def test_elo_even_match():
+    wdl = np.array([[[0, 0, 0], [30, 40, 30]], [[30, 40, 30], [0, 0, 0]]])
+    assert elo_ratings(wdl) == pytest.approx([ELO_BASE, ELO_BASE])
+
+
+@pytest.mark.parametrize("wins, losses", [(75, 25), (100, 0)])
+def test_elo_two_players(wins, losses):
+    wdl = np.array([[[0, 0, 0], [wins, 0, losses]], [[losses, 0, wins], [0, 0, 0]]])
+    elo = elo_ratings(wdl)
+    # With one virtual draw the strengths are in the ratio of the scores
+    gap = 400 * math.log10((wins + 0.5) / (losses + 0.5))
+    assert elo[0] - elo[1] == pytest.approx(gap)
+    assert elo.mean() == pytest.approx(ELO_BASE)
+
+
+def test_elo_order():
+    # Each entrant scores 70% against the next one and 90% against the last
+    scores = {(0, 1): 70, (1, 2): 70, (0, 2): 90}
+    wdl = np.zeros((3, 3, 3), dtype=np.int64)
+    for (i, j), wins in scores.items():
+        wdl[i, j] = (wins, 0, 100 - wins)
+        wdl[j, i] = (100 - wins, 0, wins)
+    elo = elo_ratings(wdl)
+    assert elo[0] > elo[1] > elo[2]
+    assert elo.mean() == pytest.approx(ELO_BASE)
+
+
+def test_round_robin():
+    entrants = ["Solved", "Random", "Random"]
+    results = round_robin(entrants, games=30, workers=2, chunk=7, seed=3)
+    wdl = results["wdl"]
+
+    assert results["entrants"] == entrants
+    assert results["games"] == 3 * 2 * 30
+    for i in range(3):
+        assert not wdl[i, i].any()
+        for j in range(3):
+            if i != j:
+                assert wdl[i, j].sum() == 60
+                assert list(wdl[i, j]) == list(wdl[j, i][::-1])
+    assert wdl[0, 1:, 2].sum() == 0
+    assert results["elo"][0] == max(results["elo"])
+
+    again = round_robin(entrants, games=30, workers=1, chunk=7, seed=3)
+    assert np.array_equal(again["wdl"], wdl)
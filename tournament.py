@@ -0,0 +1,197 @@
+# tournament.py
+
+"""
+Round-robin tournaments between registry agents.
+
+Every pair of entrants plays `games` games with each side as X, spread
+over a process pool in chunks. Results come back as a win / draw / loss
+matrix and Elo ratings fitted to all games.
+
+An entrant is a registry name, optionally with options after a colon:
+
+    Minimax
+    Q-Learning:model=q_agent.bin           # a saved snapshot
+    Q-Learning:episodes=5000               # trained on the fly
+    MCTS:iterations=200,seed=1
+
+    python tournament.py Solved Q-Learning:model=q_agent.bin Random [--games 1000]
+"""
+
+import argparse
+import ast
+import itertools
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from env import TicTacToeEnv
+from registry import make_agent
+
+ELO_BASE = 1500
+
+
+def parse_entrant(spec: str):
+    """(name, options) of an entrant spec such as "MCTS:iterations=200"."""
+    name, _, rest = spec.partition(":")
+    options = {}
+    for item in filter(None, rest.split(",")):
+        key, _, value = item.partition("=")
+        try:
+            options[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            options[key.strip()] = value.strip()
+    return name, options
+
+
+# ── Worker side ─────────────────────────────────────────────────────────────
+
+_agents = {}
+
+
+def _init_worker():
+    from model_cache import CACHE
+    CACHE.warm()
+
+
+def _agent(spec: str, player: int):
+    """Registry agent for `spec`, built once per process and colour."""
+    agent = _agents.get((spec, player))
+    if agent is None:
+        name, options = parse_entrant(spec)
+        agent = _agents[spec, player] = make_agent(name, player, **options)
+    return agent
+
+
+def play_games(args):
+    """
+    Pool task: play `games` games of `x_spec` (as X) against `o_spec`.
+    Returns (x_wins, o_wins, draws).
+    """
+    x_spec, o_spec, games, seed = args
+    random.seed(seed)
+    agents = {1: _agent(x_spec, 1), -1: _agent(o_spec, -1)}
+    env = TicTacToeEnv()
+
+    counts = [0, 0, 0]
+    for _ in range(games):
+        env.reset()
+        player = 1
+        while not env.done:
+            env.step(agents[player].select_move(env), player)
+            player = -player
+        counts[0 if env.winner == 1 else 1 if env.winner == -1 else 2] += 1
+    return tuple(counts)
+
+
+# ── Tournament ──────────────────────────────────────────────────────────────
+
+def elo_ratings(wdl) -> np.ndarray:
+    """
+    Elo ratings (mean ELO_BASE) that best explain a win / draw / loss
+    matrix, by the Bradley-Terry maximum-likelihood fit with draws as
+    half a win. One virtual draw per pairing keeps perfect records
+    finite.
+    """
+    wins, draws, losses = wdl[..., 0], wdl[..., 1], wdl[..., 2]
+    played = wins + draws + losses
+    pairs = played > 0
+    score = np.where(pairs, wins + draws / 2 + 0.5, 0.0)
+    games = np.where(pairs, played + 1, 0.0)
+
+    strength = np.ones(len(wdl))
+    for _ in range(10_000):
+        total = strength[:, None] + strength[None, :]
+        updated = score.sum(1) / (games / total).sum(1)
+        updated /= np.exp(np.log(updated).mean())
+        converged = np.abs(updated - strength).max() < 1e-10
+        strength = updated
+        if converged:
+            break
+    return ELO_BASE + 400 * np.log10(strength)
+
+
+def round_robin(entrants, games: int = 1_000, workers: int = None,
+                chunk: int = 250, seed: int = 0):
+    """
+    Play every pair of `entrants` (specs, see parse_entrant) for `games`
+    games with each side as X, in chunks of `chunk` games on a pool of
+    `workers` processes.
+
+    Returns a dict with
+      entrants: the specs, in matrix order
+      wdl:      int array (n, n, 3); wdl[i, j] = (wins, draws, losses)
+                of entrant i against entrant j over both colours
+      elo:      float array (n,) from elo_ratings(wdl)
+      games:    total games played
+      seconds:  wall time
+    """
+    n = len(entrants)
+    workers = workers or os.cpu_count() or 1
+    tasks, owners = [], []
+    seeds = itertools.count(seed)
+    for i, j in itertools.combinations(range(n), 2):
+        for x, o in ((i, j), (j, i)):
+            for start in range(0, games, chunk):
+                tasks.append((entrants[x], entrants[o], min(chunk, games - start), next(seeds)))
+                owners.append((x, o))
+
+    wdl = np.zeros((n, n, 3), dtype=np.int64)
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        for (x, o), (x_wins, o_wins, draws) in zip(owners, pool.imap(play_games, tasks)):
+            wdl[x, o] += (x_wins, draws, o_wins)
+            wdl[o, x] += (o_wins, draws, x_wins)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "entrants": list(entrants),
+        "wdl": wdl,
+        "elo": elo_ratings(wdl),
+        "games": int(wdl.sum()) // 2,
+        "seconds": elapsed,
+    }
+
+
+def report(results):
+    """Print the W/D/L matrix and the ratings, strongest first."""
+    entrants, wdl, elo = results["entrants"], results["wdl"], results["elo"]
+    labels = [f"{i + 1}. {spec}" for i, spec in enumerate(entrants)]
+    width = max(len(label) for label in labels)
+    cell = max(len(f"{a}/{b}/{c}") for a, b, c in wdl.reshape(-1, 3)) + 2
+
+    print(f"{results['games']:,} games in {results['seconds']:.1f} s "
+          f"({results['games'] / results['seconds']:,.0f}/s); rows: W/D/L vs column")
+    print(" " * width + "".join(f"{k:>{cell}}" for k in range(1, len(entrants) + 1)))
+    for i, label in enumerate(labels):
+        row = "".join(
+            f"{'-' if i == j else '/'.join(map(str, wdl[i, j])):>{cell}}"
+            for j in range(len(entrants))
+        )
+        print(f"{label:<{width}}{row}")
+
+    print("\nElo")
+    for i in np.argsort(-elo):
+        print(f"  {elo[i]:7.0f}  {labels[i]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round-robin tournament between agents.")
+    parser.add_argument(
+        "entrants", nargs="*", default=["Solved", "Minimax", "Q-Learning", "Random"],
+        help="registry names, optionally with options: Name:key=value,...",
+    )
+    parser.add_argument("--games", type=int, default=1_000,
+                        help="games per pairing and colour")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=250,
+                        help="games per pool task")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report(round_robin(
+        args.entrants, games=args.games, workers=args.workers,
+        chunk=args.chunk, seed=args.seed,
+    ))
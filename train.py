@@ -1,8 +1,135 @@
 # train.py
 
+import argparse
+import multiprocessing
+import os
 import random
-from env import TicTacToeEnv
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from env import FULL, IS_WIN, MOVES, TicTacToeEnv, bits_to_state, rank
 from agent import QLearningAgent
+from batch_env import BatchTicTacToeEnv
+from checkpoint import Checkpointer, restore
+from gamelog import GameLogWriter
+from replay import ReplayBuffer
+from telemetry import JsonlSink, Telemetry
+
+
+def run_episode(env, agent, visits=None, draw_reward: float = 0.0, learn=None,
+                first: int = 1):
+    """
+    Play one training episode (agent is X, opponent is uniform-random O)
+    and return the winner. With first=-1 the opponent opens the game, so
+    the agent learns the second mover's positions.
+
+    Each agent move is updated once the opponent has replied, so the
+    target bootstraps from the agent's next decision state and a loss on
+    the opponent's move is rewarded -1. Draws are rewarded `draw_reward`.
+
+    visits: optional dict counting Q-updates per (state, action)
+    learn:  called with each transition instead of agent.update (e.g.
+            ReplayBuffer.add)
+    """
+    learn = learn or agent.update
+    state = env.reset()
+    done = False
+    if first == -1:
+        state, _, _, _ = env.step(random.choice(env.available_actions()), player=-1)
+
+    # Agent is always X
+    while not done:
+        # ---------- AGENT MOVE (X) ----------
+        available_actions = env.available_actions()
+        action = agent.choose_action(state, available_actions)
+
+        next_state, reward, done, _ = env.step(action, player=1)
+
+        # ---------- OPPONENT MOVE (O, random) ----------
+        if not done:
+            opp_action = random.choice(env.available_actions())
+            next_state, opp_reward, done, _ = env.step(opp_action, player=-1)
+            reward = -opp_reward
+
+        if done and env.winner == 0:
+            reward = draw_reward
+        next_available_actions = env.available_actions() if not done else []
+
+        learn(
+            state,
+            action,
+            reward,
+            next_state,
+            next_available_actions
+        )
+        if visits is not None:
+            visits[state, action] = visits.get((state, action), 0) + 1
+
+        state = next_state
+
+    return env.winner
+
+
+def timed_episode(env, agent, phases, draw_reward: float = 0.0, learn=None,
+                  first: int = 1):
+    """
+    run_episode() with a timer around each phase: seconds spent in
+    choose_action, update (or `learn`), the agent's env.step and the
+    opponent's move are added to the matching keys of `phases`
+    (telemetry.PHASES). Kept separate so untimed episodes pay nothing.
+    """
+    clock = time.perf_counter
+    learn = learn or agent.update
+    state = env.reset()
+    done = False
+    choose = update = step = opponent = 0.0
+    if first == -1:
+        t0 = clock()
+        state, _, _, _ = env.step(random.choice(env.available_actions()), player=-1)
+        opponent += clock() - t0
+
+    while not done:
+        t0 = clock()
+        available_actions = env.available_actions()
+        action = agent.choose_action(state, available_actions)
+        t1 = clock()
+        next_state, reward, done, _ = env.step(action, player=1)
+        t2 = clock()
+
+        if not done:
+            opp_action = random.choice(env.available_actions())
+            next_state, opp_reward, done, _ = env.step(opp_action, player=-1)
+            reward = -opp_reward
+        t3 = clock()
+
+        if done and env.winner == 0:
+            reward = draw_reward
+        next_available_actions = env.available_actions() if not done else []
+        learn(state, action, reward, next_state, next_available_actions)
+        t4 = clock()
+
+        choose += t1 - t0
+        step += t2 - t1
+        opponent += t3 - t2
+        update += t4 - t3
+        state = next_state
+
+    phases["choose_action"] += choose
+    phases["update"] += update
+    phases["env_step"] += step
+    phases["opponent"] += opponent
+    return env.winner
+
+
+def _record(stats, winner):
+    if winner == 1:
+        stats["win"] += 1
+    elif winner == -1:
+        stats["loss"] += 1
+    else:
+        stats["draw"] += 1
 
 
 def train(
@@ -12,25 +139,373 @@ def train(
     epsilon: float = 1.0,
     epsilon_decay: float = 0.99995,
     epsilon_min: float = 0.05,
+    dense: bool = False,
+    draw_reward: float = 0.0,
+    symmetric: bool = False,
+    both_roles: bool = False,
+    log_dir: str = None,
+    replay: str = None,
+    replay_capacity: int = 50_000,
+    replay_batch: int = 128,
+    replay_every: int = 1,
+    telemetry: Telemetry = None,
+    checkpoint_dir: str = None,
+    checkpoint_every: int = 10_000,
+    resume_from: str = None,
 ):
+    """
+    both_roles: let the random opponent open every other episode, so the
+             table also covers the positions the agent meets as the
+             second mover (registry.QPolicy needs them to play O)
+    log_dir: optional directory to record every training game in
+             (gamelog.py, file prefix "train")
+    replay:  None to update online after every move; "uniform" or
+             "prioritized" to store transitions in a ReplayBuffer
+             (replay.py) of `replay_capacity` and instead learn from a
+             minibatch of `replay_batch` every `replay_every` episodes.
+             Uses a dense table; not available with symmetric=True.
+             A smaller alpha (~0.2) suits replay; see bench/replay.py.
+    telemetry: optional telemetry.Telemetry receiving phase timings,
+             progress records and profiles (closed when training ends)
+    checkpoint_dir: write an incremental checkpoint (checkpoint.py) here
+             every `checkpoint_every` episodes and at the end
+    resume_from: continue the run checkpointed in this directory:
+             Q-table, alpha, gamma, epsilon, counts and random state come
+             from its last checkpoint, and training goes on until
+             `episodes` episodes in total. epsilon_decay, epsilon_min,
+             draw_reward and both_roles must match the checkpointed run
+             (ValueError otherwise). Pass the same directory as
+             checkpoint_dir to keep extending its chain.
+
+    Checkpointing uses a dense table and is not available in replay mode
+    (the buffer is not saved).
+    """
+    if replay not in (None, "uniform", "prioritized"):
+        raise ValueError(f"Unknown replay mode: {replay!r}")
+    if replay and symmetric:
+        raise ValueError("replay mode does not support symmetric tables")
+    checkpointing = bool(checkpoint_dir or resume_from)
+    if replay and checkpointing:
+        raise ValueError("replay mode does not support checkpoints")
+
     env = TicTacToeEnv()
-    agent = QLearningAgent(alpha=alpha, gamma=gamma, epsilon=epsilon)
+    agent = QLearningAgent(
+        alpha=alpha, gamma=gamma, epsilon=epsilon,
+        dense=dense or bool(replay) or checkpointing, symmetric=symmetric,
+    )
+    agent.both_roles = both_roles
+    buffer = learn = None
+    if replay:
+        buffer = ReplayBuffer(replay_capacity, prioritized=replay == "prioritized")
+        learn = buffer.add
+    log = GameLogWriter(log_dir, prefix="train") if log_dir else None
 
+    # Arguments that shape the run but are not restored from a checkpoint
+    settings = {
+        "epsilon_decay": epsilon_decay, "epsilon_min": epsilon_min,
+        "draw_reward": draw_reward, "both_roles": both_roles,
+    }
     stats = {"win": 0, "loss": 0, "draw": 0}
+    if resume_from:
+        restore(resume_from, agent, stats, settings)
+    checkpointer = None
+    if checkpoint_dir:
+        checkpointer = Checkpointer(
+            checkpoint_dir, agent, resumed=checkpoint_dir == resume_from,
+            settings=settings,
+        )
+    if telemetry is not None:
+        telemetry.start(agent.episodes)
 
-    for episode in range(episodes):
-        state = env.reset()
-        done = False
+    for episode in range(agent.episodes, episodes):
+        first = -1 if both_roles and episode % 2 else 1
+        if telemetry is not None and telemetry.sample(episode):
+            winner = timed_episode(env, agent, telemetry.phases, draw_reward, learn, first)
+        else:
+            winner = run_episode(env, agent, draw_reward=draw_reward, learn=learn, first=first)
+        _record(stats, winner)
+        agent.episodes += 1
+        if buffer is not None and (episode + 1) % replay_every == 0 \
+                and len(buffer) >= replay_batch:
+            buffer.learn(agent.Q.values, replay_batch, alpha, gamma)
+        if log is not None:
+            log.write(env.history, env.winner, first)
+
+        # ---------- Epsilon decay ----------
+        agent.epsilon = max(epsilon_min, agent.epsilon * epsilon_decay)
+
+        if telemetry is not None:
+            telemetry.episode_end(episode + 1, agent, stats)
+        if checkpointer is not None and (episode + 1) % checkpoint_every == 0:
+            checkpointer.save(stats)
+
+        # Optional progress log
+        if (episode + 1) % 10_000 == 0:
+            print(
+                f"Episode {episode+1}/{episodes} | "
+                f"W:{stats['win']} L:{stats['loss']} D:{stats['draw']} | "
+                f"ε={agent.epsilon:.3f}"
+            )
+
+    if log is not None:
+        log.close()
+    if telemetry is not None:
+        telemetry.close()
+    if checkpointer is not None:
+        if checkpointer.saved_episode != agent.episodes:
+            checkpointer.save(stats)
+        checkpointer.close()
+
+    print("\nTraining finished")
+    print("Q-table size:", len(agent.Q))
+
+    return agent, stats
 
-        # Agent is always X
-        while not done:
-            # ---------- AGENT MOVE (X) ----------
-            available_actions = env.available_actions()
-            action = agent.choose_action(state, available_actions)
 
+def train_from_log(agent, games, draw_reward: float = 0.0) -> int:
+    """
+    Replay recorded games (gamelog.read_games) into `agent`, applying the
+    same Q-updates run_episode would have made for X (including games
+    where O moved first, as with both_roles=True). Unfinished games are
+    skipped. Returns the number of games replayed.
+    """
+    env = TicTacToeEnv()
+    replayed = 0
+    for moves, winner, first in games:
+        if winner is None:
+            continue
+        state = env.reset()
+        start = 0
+        if first == -1:
+            state, _, _, _ = env.step(moves[0], player=-1)
+            start = 1
+        for i in range(start, len(moves), 2):
+            action = moves[i]
             next_state, reward, done, _ = env.step(action, player=1)
+            if not done:
+                next_state, opp_reward, done, _ = env.step(moves[i + 1], player=-1)
+                reward = -opp_reward
+            if done and env.winner == 0:
+                reward = draw_reward
             next_available_actions = env.available_actions() if not done else []
+            agent.update(state, action, reward, next_state, next_available_actions)
+            state = next_state
+        replayed += 1
+    return replayed
+
+
+# ── Parallel training ───────────────────────────────────────────────────────
+
+def _export_q(agent):
+    """Plain-dict copy of agent.Q (the defaultdict factory cannot be pickled)."""
+    return {state: dict(q) for state, q in agent.Q.items()}
+
+
+def _train_worker(args):
+    """
+    Pool task: train a private agent for one round, starting from the
+    shared snapshot. Returns (Q, visits, stats).
+    """
+    (q_snapshot, alpha, gamma, epsilon, epsilon_decay, epsilon_min,
+     draw_reward, both_roles, episodes, seed) = args
+
+    random.seed(seed)
+    env = TicTacToeEnv()
+    agent = QLearningAgent(alpha=alpha, gamma=gamma, epsilon=epsilon)
+    for state, q in q_snapshot.items():
+        agent.Q[state].update(q)
+
+    visits = {}
+    stats = {"win": 0, "loss": 0, "draw": 0}
+    for episode in range(episodes):
+        first = -1 if both_roles and episode % 2 else 1
+        _record(stats, run_episode(env, agent, visits, draw_reward, first=first))
+        agent.epsilon = max(epsilon_min, agent.epsilon * epsilon_decay)
+
+    return _export_q(agent), visits, stats
+
+
+def merge_q_tables(snapshot, results, method: str = "average"):
+    """
+    Combine worker Q-tables that all started from `snapshot`.
+
+    method:
+      "average" — plain mean over workers
+      "visits"  — mean weighted by how often each worker updated the
+                  (state, action) pair this round; untouched pairs keep
+                  the snapshot value
+    """
+    if method not in ("average", "visits"):
+        raise ValueError(f"Unknown merge method: {method!r}")
 
+    keys = set()
+    for q_table, _, _ in results:
+        for state, q in q_table.items():
+            keys.update((state, action) for action in q)
+
+    merged = defaultdict(dict)
+    for state, action in keys:
+        base = snapshot.get(state, {}).get(action, 0.0)
+        if method == "average":
+            total = sum(
+                q_table.get(state, {}).get(action, base)
+                for q_table, _, _ in results
+            )
+            merged[state][action] = total / len(results)
+        else:
+            weight = value = 0.0
+            for q_table, visits, _ in results:
+                n = visits.get((state, action), 0)
+                if n:
+                    weight += n
+                    value += n * q_table[state][action]
+            merged[state][action] = value / weight if weight else base
+
+    return dict(merged)
+
+
+def train_parallel(
+    episodes: int = 100_000,
+    workers: int = None,
+    merge_every: int = 10_000,
+    merge: str = "average",
+    seed: int = 0,
+    alpha: float = 0.5,
+    gamma: float = 0.9,
+    epsilon: float = 1.0,
+    epsilon_decay: float = 0.99995,
+    epsilon_min: float = 0.05,
+    draw_reward: float = 0.0,
+    both_roles: bool = False,
+):
+    """
+    Q-learning with episodes spread over a process pool.
+
+    Every round plays `merge_every` episodes in total, split evenly across
+    `workers` processes. Each worker has its own agent and seed, and starts
+    from the merged table of the previous round. Each worker decays epsilon
+    by epsilon_decay ** workers per episode, so that after a round all of
+    them match the schedule of a single-process run of the same length.
+    both_roles: as in train(); each worker alternates who opens.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    q_table = {}
+    stats = {"win": 0, "loss": 0, "draw": 0}
+    done = 0
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(workers) as pool:
+        while done < episodes:
+            round_episodes = min(merge_every, episodes - done)
+            shares = [
+                round_episodes // workers + (i < round_episodes % workers)
+                for i in range(workers)
+            ]
+            round_epsilon = max(epsilon_min, epsilon * epsilon_decay ** done)
+            tasks = [
+                (q_table, alpha, gamma, round_epsilon, epsilon_decay ** workers,
+                 epsilon_min, draw_reward, both_roles, share, seed + done + i)
+                for i, share in enumerate(shares) if share
+            ]
+            results = pool.map(_train_worker, tasks)
+
+            q_table = merge_q_tables(q_table, results, merge)
+            for _, _, worker_stats in results:
+                for outcome, count in worker_stats.items():
+                    stats[outcome] += count
+            done += round_episodes
+
+            elapsed = time.perf_counter() - start
+            print(
+                f"Episode {done}/{episodes} | "
+                f"W:{stats['win']} L:{stats['loss']} D:{stats['draw']} | "
+                f"ε={max(epsilon_min, epsilon * epsilon_decay ** done):.3f} | "
+                f"{done / elapsed:,.0f} ep/s"
+            )
+
+    agent = QLearningAgent(
+        alpha=alpha,
+        gamma=gamma,
+        epsilon=max(epsilon_min, epsilon * epsilon_decay ** episodes),
+    )
+    for state, q in q_table.items():
+        agent.Q[state].update(q)
+    agent.episodes = episodes
+    agent.both_roles = both_roles
+
+    print("\nTraining finished")
+    print("Q-table size:", len(agent.Q))
+
+    return agent, stats
+
+
+# ── Batched training ────────────────────────────────────────────────────────
+
+def train_batch(
+    episodes: int = 100_000,
+    batch_size: int = 256,
+    alpha: float = 0.5,
+    gamma: float = 0.9,
+    epsilon: float = 1.0,
+    epsilon_decay: float = 0.99995,
+    epsilon_min: float = 0.05,
+    draw_reward: float = 0.0,
+    both_roles: bool = False,
+    seed=None,
+):
+    """
+    Same learning rule as train(), but `batch_size` games advance together
+    in a BatchTicTacToeEnv. Opponent moves for the whole batch come from a
+    single vectorized sample. Epsilon decays once per finished game. The
+    last batch may finish a few more than `episodes` games.
+
+    both_roles: as in train(); the opponent opens every game in the odd
+                slots of the batch.
+    """
+    first = np.ones(batch_size, dtype=np.int8)
+    if both_roles:
+        first[1::2] = -1
+    env = BatchTicTacToeEnv(batch_size, seed=seed, first=first)
+    agent = QLearningAgent(alpha=alpha, gamma=gamma, epsilon=epsilon)
+    agent.both_roles = both_roles
+
+    stats = {"win": 0, "loss": 0, "draw": 0}
+    finished = 0
+    next_log = 10_000
+
+    # game -> (state, action) of the agent move awaiting the opponent's reply
+    pending = {}
+
+    while finished < episodes:
+        # ---------- OPPONENT MOVES (O, random, whole batch) ----------
+        actions = env.random_actions()
+
+        # ---------- AGENT MOVES (X) ----------
+        agent_games = np.nonzero(env.to_move == 1)[0].tolist()
+        for g in agent_games:
+            state = tuple(env.boards[g].tolist())
+            available_actions = [i for i, v in enumerate(state) if v == 0]
+            actions[g] = action = agent.choose_action(state, available_actions)
+            pending[g] = (state, action)
+
+        boards, rewards, dones, winners = env.step(actions)
+
+        # ---------- Updates (see run_episode) ----------
+        movers = np.zeros(batch_size, dtype=bool)
+        movers[agent_games] = True
+        for g in np.nonzero(dones | ~movers)[0].tolist():
+            if g not in pending:
+                # The opponent's opening move; no agent move to update yet
+                continue
+            state, action = pending.pop(g)
+            next_state = tuple(boards[g].tolist())
+            if dones[g]:
+                reward = draw_reward if winners[g] == 0 else int(winners[g])
+                next_available_actions = []
+            else:
+                reward = 0
+                next_available_actions = [i for i, v in enumerate(next_state) if v == 0]
             agent.update(
                 state,
                 action,
@@ -39,33 +514,24 @@ def train(
                 next_available_actions
             )
 
-            state = next_state
-
-            if done:
-                break
-
-            # ---------- OPPONENT MOVE (O, random) ----------
-            opp_action = random.choice(env.available_actions())
-            state, _, done, _ = env.step(opp_action, player=-1)
-
-        # ---------- Stats ----------
-        if env.winner == 1:
-            stats["win"] += 1
-        elif env.winner == -1:
-            stats["loss"] += 1
-        else:
-            stats["draw"] += 1
-
-        # ---------- Epsilon decay ----------
-        agent.epsilon = max(epsilon_min, agent.epsilon * epsilon_decay)
+        # ---------- Stats / epsilon decay ----------
+        ended = np.nonzero(dones)[0]
+        if len(ended):
+            for winner in winners[ended].tolist():
+                _record(stats, winner)
+            finished += len(ended)
+            agent.episodes = finished
+            agent.epsilon = max(
+                epsilon_min, agent.epsilon * epsilon_decay ** len(ended)
+            )
 
-        # Optional progress log
-        if (episode + 1) % 10_000 == 0:
+        if finished >= next_log:
             print(
-                f"Episode {episode+1}/{episodes} | "
+                f"Episode {finished}/{episodes} | "
                 f"W:{stats['win']} L:{stats['loss']} D:{stats['draw']} | "
                 f"ε={agent.epsilon:.3f}"
             )
+            next_log += 10_000
 
     print("\nTraining finished")
     print("Q-table size:", len(agent.Q))
@@ -73,5 +539,188 @@ def train(
     return agent, stats
 
 
+# ── Planning ────────────────────────────────────────────────────────────────
+
+def _afterstate_model(draw_reward: float, both_roles: bool = False):
+    """
+    Enumerate the agent's (X's) decision states reachable against a random
+    O, grouped by move number, and the exact one-step model of each
+    (state, action). With both_roles, the states of games O opened are
+    included too (layer k then holds both kinds after k agent moves):
+
+      states      list of (x, o) bitboards, layer by layer
+      layers      [(first, end) state index range of each layer]
+      legal       bool (S, 9)
+      reward      float (S, 9) expected terminal reward of the step
+      t_sa, t_next, t_p
+                  transitions to non-terminal next decision states: flat
+                  (state * 9 + action) index, next state index, probability
+    """
+    states, layers = [], []
+    index = {}
+    layer = [(0, 0)]
+    if both_roles:
+        layer += [(0, 1 << b) for b in range(9)]
+    while layer:
+        layers.append((len(states), len(states) + len(layer)))
+        for position in layer:
+            index[position] = len(states)
+            states.append(position)
+        nxt = {}
+        for x, o in layer:
+            for a in MOVES[FULL ^ (x | o)]:
+                x2 = x | 1 << a
+                if IS_WIN[x2] or x2 | o == FULL:
+                    continue
+                for b in MOVES[FULL ^ (x2 | o)]:
+                    o2 = o | 1 << b
+                    if not IS_WIN[o2] and x2 | o2 != FULL:
+                        nxt[x2, o2] = None
+        layer = list(nxt)
+
+    legal = np.zeros((len(states), 9), dtype=bool)
+    reward = np.zeros((len(states), 9))
+    t_sa, t_next, t_p = [], [], []
+    for s, (x, o) in enumerate(states):
+        for a in MOVES[FULL ^ (x | o)]:
+            legal[s, a] = True
+            x2 = x | 1 << a
+            if IS_WIN[x2]:
+                reward[s, a] = 1.0
+                continue
+            if x2 | o == FULL:
+                reward[s, a] = draw_reward
+                continue
+            replies = MOVES[FULL ^ (x2 | o)]
+            p = 1.0 / len(replies)
+            for b in replies:
+                o2 = o | 1 << b
+                if IS_WIN[o2]:
+                    reward[s, a] -= p
+                elif x2 | o2 == FULL:
+                    reward[s, a] += p * draw_reward
+                else:
+                    t_sa.append(s * 9 + a)
+                    t_next.append(index[x2, o2])
+                    t_p.append(p)
+
+    return (states, layers, legal, reward,
+            np.array(t_sa), np.array(t_next), np.array(t_p))
+
+
+def train_sweep(
+    gamma: float = 0.9,
+    draw_reward: float = 0.0,
+    sweep: str = "synchronous",
+    tol: float = 1e-6,
+    max_iterations: int = 100,
+    both_roles: bool = False,
+):
+    """
+    Solve for the Q-values that train() converges to, by value iteration
+    over the reachable decision states instead of sampled episodes.
+
+    The random opponent is modelled as an exact expectation over its
+    replies and each backup is one vectorized pass over a dense
+    (states, 9) array. Rewards match run_episode: +1 win, -1 loss,
+    `draw_reward` draw.
+
+    sweep:
+      "synchronous" — every state backed up from the previous iteration
+      "prioritized" — layers backed up last move first, each from the
+                      values just computed; one pass is exact and a
+                      second confirms it
+
+    both_roles: also solve the positions of games the opponent opens, as
+                train(both_roles=True) learns them
+
+    Returns (agent, info) where info has iterations, seconds, states and
+    the last max |ΔQ|.
+    """
+    if sweep not in ("synchronous", "prioritized"):
+        raise ValueError(f"Unknown sweep: {sweep!r}")
+
+    start = time.perf_counter()
+    states, layers, legal, reward, t_sa, t_next, t_p = _afterstate_model(draw_reward, both_roles)
+
+    if sweep == "synchronous":
+        slices = [(0, len(states))]
+    else:
+        slices = list(reversed(layers))
+    # Transitions are generated in state order, so each slice's are contiguous
+    bounds = [np.searchsorted(t_sa, (first * 9, end * 9)) for first, end in slices]
+
+    q = np.zeros_like(reward)
+    q_flat = q.reshape(-1)
+    iterations = 0
+    delta = float("inf")
+    while delta > tol and iterations < max_iterations:
+        old = q.copy()
+        for (first, end), (lo, hi) in zip(slices, bounds):
+            values = np.where(legal, q, -np.inf).max(1)
+            backup = np.bincount(
+                t_sa[lo:hi] - first * 9,
+                weights=t_p[lo:hi] * values[t_next[lo:hi]],
+                minlength=(end - first) * 9,
+            )
+            q_flat[first * 9:end * 9] = (
+                reward[first:end].reshape(-1) + gamma * backup
+            )
+        delta = float(np.abs(q - old).max())
+        iterations += 1
+
+    agent = QLearningAgent(gamma=gamma, epsilon=0.0, dense=True)
+    agent.both_roles = both_roles
+    agent.Q.values[[rank(x, o) for x, o in states]] = q
+    for x, o in states:
+        agent.Q[bits_to_state(x, o)]
+    seconds = time.perf_counter() - start
+
+    print(
+        f"{sweep.capitalize()} sweeps converged in {iterations} iterations "
+        f"({seconds * 1e3:.1f} ms, max |ΔQ| {delta:.1e})"
+    )
+    print("Q-table size:", len(agent.Q))
+
+    return agent, {
+        "iterations": iterations,
+        "seconds": seconds,
+        "states": len(states),
+        "delta": delta,
+    }
+
+
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train a Q-learning agent.")
+    parser.add_argument("--episodes", type=int, default=100_000)
+    parser.add_argument("--telemetry", metavar="PATH", default=None,
+                        help="append telemetry records to PATH (JSON lines)")
+    parser.add_argument("--sample-every", type=int, default=100,
+                        help="time the phases of one episode in N")
+    parser.add_argument("--report-every", type=int, default=10_000)
+    parser.add_argument("--profile", choices=["cprofile", "tracemalloc"], default=None,
+                        help="capture a profile over --profile-window (needs --telemetry)")
+    parser.add_argument("--profile-window", type=int, nargs=2, default=[1_000, 2_000],
+                        metavar=("START", "STOP"))
+    parser.add_argument("--profile-path", default=None,
+                        help="also dump the cProfile stats here")
+    parser.add_argument("--checkpoint-dir", default=None,
+                        help="write incremental checkpoints here")
+    parser.add_argument("--checkpoint-every", type=int, default=10_000)
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the run in --checkpoint-dir")
+    args = parser.parse_args()
+
+    telemetry = None
+    if args.telemetry:
+        telemetry = Telemetry(
+            [JsonlSink(args.telemetry)], sample_every=args.sample_every,
+            report_every=args.report_every, profile=args.profile,
+            profile_window=args.profile_window, profile_path=args.profile_path,
+        )
+    train(
+        episodes=args.episodes, telemetry=telemetry,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every,
+        resume_from=args.checkpoint_dir if args.resume else None,
+    )
@@ -0,0 +1,54 @@
+# zobrist.py
+
+"""
+Zobrist hashing of board positions.
+
+Every (cell, side) pair gets a fixed random 64-bit number and a
+position's key is the XOR of the numbers of its stones. Playing or
+taking back a move is then a single XOR, whatever the board size, where
+hashing `tuple(board)` costs O(cells) per lookup.
+
+TicTacToeEnv and MNKEnv keep the key of their position in `env.key`.
+It depends only on the stones; when the same stones with a different
+player to move must not share an entry, use `with_side(env.key, player)`.
+Keys are plain ints and work as dict keys anywhere a state tuple does,
+e.g. agent.choose_action(env.key, ...) with a dict-backed Q-table.
+"""
+
+import random
+from functools import lru_cache
+
+SEED = 0x2B0B21
+
+# XORed into the key when O is to move (see with_side)
+SIDE_TO_MOVE = random.Random(SEED).getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def zobrist_table(cells: int):
+    """
+    (x_keys, o_keys): the random number of every cell for X and for O on
+    a board of `cells` cells. Fixed for a given size, so keys are stable
+    across runs and processes.
+    """
+    rng = random.Random(SEED + cells)
+    x_keys = tuple(rng.getrandbits(64) for _ in range(cells))
+    o_keys = tuple(rng.getrandbits(64) for _ in range(cells))
+    return x_keys, o_keys
+
+
+def board_key(board) -> int:
+    """Key of a board (1 / -1 / 0 per cell), computed from scratch."""
+    x_keys, o_keys = zobrist_table(len(board))
+    key = 0
+    for cell, v in enumerate(board):
+        if v == 1:
+            key ^= x_keys[cell]
+        elif v == -1:
+            key ^= o_keys[cell]
+    return key
+
+
+def with_side(key: int, player: int) -> int:
+    """`key` extended with the side to move (`player`, +1 or -1)."""
+    return key ^ SIDE_TO_MOVE if player == -1 else key